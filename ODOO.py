@@ -1,20 +1,42 @@
 # ODOO Automation Script - Excel Integration
-import os, sys, time, logging, random, pandas as pd
+import os, re, hashlib, sys, time, json, math, queue, shutil, difflib, logging, random, argparse, subprocess, statistics, threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException, ElementClickInterceptedException
+
+# pandas dan Selenium di-import secara lazy: keduanya berat dan tidak dibutuhkan
+# untuk pre-flight / workbook kosong (lihat load_selenium dan load_excel_data)
+webdriver = Service = Keys = By = ActionChains = EC = WebDriverWait = None
+TimeoutException = NoSuchElementException = WebDriverException = None
+StaleElementReferenceException = ElementClickInterceptedException = UnexpectedAlertPresentException = None
+
+def load_selenium():
+    """Import the Selenium stack on first use"""
+    global webdriver, Service, Keys, By, ActionChains, EC, WebDriverWait
+    global TimeoutException, NoSuchElementException, WebDriverException
+    global StaleElementReferenceException, ElementClickInterceptedException, UnexpectedAlertPresentException
+    if webdriver is not None:
+        return
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.action_chains import ActionChains
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException, ElementClickInterceptedException, UnexpectedAlertPresentException
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(funcName)s : %(lineno)d - %(message)s')
 logger = logging.getLogger(__name__)
 log_file = "automation_log.txt"
 
+# XPath form yang dipakai di lebih dari satu tempat
+FORM_CREATE_BUTTON_XPATH = "/html/body/div[1]/div/div[1]/div[2]/div[1]/div/div[1]/button[2]"
+DOCKET_FIELD_XPATH = "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[1]/tbody/tr[3]/td[2]/div/div/input"
+PROYEK_FIELD_XPATH = "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[1]/tbody/tr[2]/td[2]/div/div/input"
+
 def logger_debug(pesan):
     waktu = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
     log_message = f"{waktu} {pesan}"
@@ -36,11 +58,14 @@ class ExcelDataProcessor:
     def __init__(self, excel_file_path):
         self.excel_file_path = excel_file_path
         self.data = None
+        self._prepared = {}
+        self._executor = None
         self.load_excel_data()
     
     def load_excel_data(self):
         """Load data from Excel file"""
         try:
+            import pandas as pd
             self.data = pd.read_excel(self.excel_file_path)
             logger.info(f"Loaded Excel file with {len(self.data)} rows")
             logger.info(f"Columns: {list(self.data.columns)}")
@@ -54,7 +79,7 @@ class ExcelDataProcessor:
             return None
         return self.data.iloc[row_index]
     
-    def should_duplicate(self, current_row_index):
+    def should_duplicate(self, current_row_index, verbose=True):
         """Check if next row has same kode_benda_uji and proyek"""
         if self.data is None or current_row_index >= len(self.data) - 1:
             return False
@@ -76,8 +101,10 @@ class ExcelDataProcessor:
         # Check if both values are the same
         same_kode = current_kode == next_kode
         same_proyek = current_proyek == next_proyek
+        if not verbose:
+            return same_kode and same_proyek
         
-        logger.info(f"Duplicate check - Current row {current_row_index + 1}:")
+        logger.info(f"Duplicate check - Current row {self.source_row(current_row_index)}:")
         logger.info(f"  Current kode_benda_uji: {current_kode}")
         logger.info(f"  Next kode_benda_uji: {next_kode}")
         logger.info(f"  Current proyek: {current_proyek}")
@@ -86,6 +113,229 @@ class ExcelDataProcessor:
         
         return same_kode and same_proyek
 
+    def prepare_row(self, row_index):
+        """Parse a row and compute everything the browser thread will enter for it"""
+        row_data = self.get_row_data(row_index)
+        if row_data is None:
+            return None
+        values = derive_row_values(row_data)
+        values['row_index'] = row_index
+        values['row_number'] = self.source_row(row_index)
+        values['duplicate_next'] = self.should_duplicate(row_index, verbose=False)
+        values['fingerprint'] = row_fingerprint(row_data)
+        return values
+
+    def start_prefetch(self, lookahead=None):
+        """Prepare upcoming rows on a background thread while the browser works"""
+        self.lookahead = ProcessingConfig.PREFETCH_LOOKAHEAD if lookahead is None else lookahead
+        if self.lookahead > 0 and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+
+    def stop_prefetch(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._prepared.clear()
+
+    def get_prepared_row(self, row_index):
+        """Return prepared values for row_index (same values on every retry)"""
+        if self._executor is not None:
+            total_rows = len(self.data)
+            for index in range(row_index, min(row_index + self.lookahead + 1, total_rows)):
+                if index not in self._prepared:
+                    self._prepared[index] = self._executor.submit(self.prepare_row, index)
+        elif row_index not in self._prepared:
+            self._prepared[row_index] = self.prepare_row(row_index)
+
+        # Buang baris yang sudah lewat
+        for index in [i for i in self._prepared if i < row_index - 1]:
+            del self._prepared[index]
+
+        prepared = self._prepared[row_index]
+        return prepared.result() if hasattr(prepared, "result") else prepared
+
+    def docket_index(self):
+        """Map normalized docket key -> row indexes for the whole workbook"""
+        index = {}
+        if self.data is None:
+            return index
+        for row_index in range(len(self.data)):
+            row_data = self.get_row_data(row_index)
+            if len(row_data) > 1:
+                index.setdefault(docket_key(row_data.iloc[1]), []).append(row_index)
+        return index
+
+    def build_chains(self):
+        """Group the plan into [create_row, duplicate_row, ...] chains"""
+        chains = []
+        for row_index, action in self.build_plan():
+            if action == "duplicate" and chains:
+                chains[-1].append(row_index)
+            else:
+                chains.append([row_index])
+        return chains
+
+    def chain_length(self, row_index):
+        """Number of rows in the duplicate chain starting at row_index"""
+        length = 1
+        while self.should_duplicate(row_index + length - 1, verbose=False):
+            length += 1
+        return length
+
+    def schedule_by_deadline(self, priority_column=None):
+        """Reorder whole duplicate chains: oldest production date first, then priority, then file order.
+
+        Production date is column 0 (tgl_mulai_prod). A lower number in
+        priority_column is more urgent; rows without a date or priority go last.
+        The DataFrame index keeps the original file position of every row.
+        """
+        import pandas as pd
+        if self.data is None or len(self.data) == 0:
+            return
+        if priority_column is not None and priority_column not in self.data.columns:
+            raise ValueError(f"Priority column '{priority_column}' not found. Columns: {list(self.data.columns)}")
+
+        dates = pd.to_datetime(self.data.iloc[:, 0], errors="coerce", dayfirst=True)
+        priorities = pd.to_numeric(self.data[priority_column], errors="coerce") if priority_column else None
+
+        def chain_key(chain):
+            chain_dates = [dates.iloc[i] for i in chain if not pd.isna(dates.iloc[i])]
+            chain_priorities = [priorities.iloc[i] for i in chain if not pd.isna(priorities.iloc[i])] if priorities is not None else []
+            return (min(chain_dates) if chain_dates else pd.Timestamp.max,
+                    min(chain_priorities) if chain_priorities else math.inf,
+                    chain[0])
+
+        chains = sorted(self.build_chains(), key=chain_key)
+        order = [row_index for chain in chains for row_index in chain]
+        self.data = self.data.iloc[order]
+        self._prepared.clear()
+        moved = sum(1 for position, row_index in enumerate(order) if position != row_index)
+        logger_debug(f"Deadline schedule: {len(chains)} chains, {moved} rows moved"
+                     + (f" (priority column '{priority_column}')" if priority_column else ""))
+        if moved:
+            logger_debug(f"  File rows in schedule order: {', '.join(str(self.source_row(i)) for i in range(min(20, len(order))))}"
+                         + (" ..." if len(order) > 20 else ""))
+
+    def source_row(self, row_index):
+        """1-based row number of a (possibly rescheduled) row in the original workbook"""
+        return int(self.data.index[row_index]) + 1
+
+    def write_unprocessed(self, row_indexes, path=None):
+        """Write rows that were not attempted to a workbook the next run can take as --excel"""
+        path = path or ProcessingConfig.UNPROCESSED_PATH
+        row_indexes = list(row_indexes)
+        if not row_indexes:
+            return 0
+        self.data.iloc[row_indexes].to_excel(path, index=False)
+        logger_debug(f"{len(row_indexes)} unprocessed rows written to {path}")
+        return len(row_indexes)
+
+    def reduce_to_delta(self, ledger):
+        """Keep only rows that are new or changed since the last run recorded in ledger.
+
+        Unchanged rows that were already saved are dropped. Changed rows whose
+        earlier version was saved are not created again: they are written to
+        NEEDS_UPDATE_PATH for updating the existing record. Returns the counts.
+        """
+        keep, needs_update, unchanged = [], [], 0
+        shared = {key for key, row_indexes in self.docket_index().items() if len(row_indexes) > 1}
+        for row_index in range(len(self.data)):
+            row_data = self.get_row_data(row_index)
+            key = docket_key(row_data.iloc[1]) if len(row_data) > 1 else ""
+            status = ledger.classify(row_data, shared=key in shared)
+            if status == "unchanged":
+                unchanged += 1
+            elif status == "update":
+                needs_update.append(row_index)
+            else:
+                keep.append(row_index)
+        if needs_update:
+            self.data.iloc[needs_update].to_excel(ProcessingConfig.NEEDS_UPDATE_PATH, index=False)
+            for row_index in needs_update:
+                logger_debug(f"Row {self.source_row(row_index)} changed after it was saved - needs update: "
+                             f"No. Docket {self.get_row_data(row_index).get('No. Docket', 'Unknown')}")
+        self.data = self.data.iloc[keep]
+        self._prepared.clear()
+        logger_debug(f"DELTA: {len(keep)} new/changed rows to process, {unchanged} unchanged skipped, "
+                     f"{len(needs_update)} need update" + (f" ({ProcessingConfig.NEEDS_UPDATE_PATH})" if needs_update else ""))
+        return {"process": len(keep), "unchanged": unchanged, "needs_update": len(needs_update)}
+
+    def build_plan(self):
+        """Return [(row_index, 'create' | 'duplicate')] as process_all_rows would walk it"""
+        if self.data is None:
+            return []
+        plan = []
+        for row_index in range(len(self.data)):
+            if row_index > 0 and self.should_duplicate(row_index - 1, verbose=False):
+                plan.append((row_index, "duplicate"))
+            else:
+                plan.append((row_index, "create"))
+        return plan
+
+class RowLedger:
+    """Fingerprints of saved rows, kept between runs so a re-exported workbook only yields its delta.
+
+    Entries map a docket key to {fingerprint: saved_at} of every row version
+    saved under that docket, so dockets shared by several rows stay distinct.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.entries = {}
+        self.pending = 0
+
+    def load(self, path):
+        self.path = path
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self.enabled = True
+        saved = sum(len(fingerprints) for fingerprints in self.entries.values())
+        logger_debug(f"Row ledger {path}: {saved} saved rows")
+
+    def classify(self, row_data, shared=False):
+        """'new', 'unchanged' (saved before, same content) or 'update' (saved before, content changed).
+
+        shared: the docket appears on several rows of the workbook, so a
+        different fingerprint cannot be tied to one saved record - it is 'new'.
+        """
+        key = docket_key(row_data.iloc[1]) if len(row_data) > 1 else ""
+        if not key:
+            return "new"
+        saved = self.entries.get(key)
+        if not saved:
+            return "new"
+        if row_fingerprint(row_data) in saved:
+            return "unchanged"
+        return "new" if shared else "update"
+
+    def mark_saved(self, values):
+        """Record the fingerprint of the row that was actually saved (prepared values of that row)"""
+        if not self.enabled or not values:
+            return
+        key = docket_key(values['no_docket'])
+        if not key:
+            return
+        self.entries.setdefault(key, {})[values['fingerprint']] = datetime.now().isoformat(timespec="seconds")
+        self.pending += 1
+        if self.pending >= ProcessingConfig.LEDGER_SAVE_EVERY:
+            self.save()
+
+    def save(self):
+        """Write the ledger atomically (a crash mid-write keeps the previous version)"""
+        if not self.enabled or not self.pending:
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.pending = 0
+
+
+# Ledger global (aktif dengan --delta)
+row_ledger = RowLedger()
+
 def resource_path(relative_path: str) -> str:
     """Get resource file path for both .py and .exe execution"""
     try:
@@ -137,6 +387,66 @@ def calculate_jam_sample(base_time):
         minute = random.randint(0, 59)
         return f"{hour:02d}:{minute:02d}"
 
+def normalize_docket(value):
+    """Canonical No. Docket text: 12345.0 / '12345.0' -> '12345', surrounding/double spaces removed"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = " ".join(str(value).split())
+    if re.fullmatch(r"\d+\.0+", text):
+        text = text.split(".")[0]
+    return text
+
+def docket_key(value):
+    """Case-insensitive matching key for a docket"""
+    return normalize_docket(value).upper()
+
+def row_fingerprint(row_data):
+    """Hash of the normalized business columns that end up in Odoo"""
+    import pandas as pd
+    parts = []
+    for column in ProcessingConfig.FINGERPRINT_COLUMNS:
+        value = row_data.iloc[column] if len(row_data) > column else None
+        if column == 1:
+            parts.append(docket_key(value))
+        elif value is None or pd.isna(value):
+            parts.append("")
+        else:
+            parts.append(" ".join(str(value).split()).upper())
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+def derive_row_values(row_data):
+    """Compute every value entered into Odoo for one Excel row"""
+    slump_value = str(row_data.iloc[6]) if len(row_data) > 6 else "10" # Column 7 (index 6)
+    slump_rencana = "12" if "12.0" in slump_value else "10"
+    base_jam = str(row_data.iloc[8]) if len(row_data) > 8 else "10:30"  # Column 9 (index 8)
+    proyek = str(row_data.iloc[3]) if len(row_data) > 3 else "-"  # Column 4 (index 3)
+    return {
+        'tgl_mulai_prod': str(row_data.iloc[0]) if len(row_data) > 0 else "None",  # Column 1 (index 0)
+        'proyek': proyek,
+        # Posisi pilihan pada dropdown autocomplete proyek
+        'proyek_option': 2 if proyek == "JALAN TOL AKSES PATIMBAN" else 1,
+        'no_docket': normalize_docket(row_data.iloc[1]) if len(row_data) > 1 else "None",  # Column 2 (index 1)
+        'kode_benda_uji': str(row_data.iloc[2]) if len(row_data) > 2 else None,  # Column 3 (index 2)
+        'slump_rencana': slump_rencana,
+        'slump_test': generate_random_slump_test(slump_rencana),
+        'yield_value': generate_random_yield(),
+        'nama_teknisi': str(row_data.iloc[4]) if len(row_data) > 4 else "TEKNISI",  # Column 5 (index 4)
+        'jam_sample': calculate_jam_sample(base_jam),
+    }
+
+def derive_line_values(values, no_urut):
+    """Compute the values of sample line no_urut (1-4) of a record"""
+    return {
+        'nomor_urut': str(no_urut),
+        'kode_benda_uji': values['kode_benda_uji'] or f" Isi Kode Benda Uji - {no_urut}",
+        # Determine test age based on sequence number
+        'rencana_umur_test': "7" if no_urut in [1, 2] else "28",
+        'bentuk_benda_uji': "Silinder 15 x 30 cm",
+        'tempat_pengetesan': ProcessingConfig.TEMPAT_PENGETESAN,
+    }
+
 def quick_delete_all(driver):
     """Delete all rows by clicking delete buttons"""
     deleted_count = 0
@@ -286,7 +596,7 @@ def select_first_row_in_modal_and_confirm(driver, wait, row_text: str | None = N
 
             # Wait for modal to disappear
             try:
-                WebDriverWait(driver, 5).until(EC.invisibility_of_element_located((
+                WebDriverWait(driver, ProcessingConfig.FIELD_WAIT_TIMEOUT).until(EC.invisibility_of_element_located((
                     By.CSS_SELECTOR, "div.modal.show, div.modal.in, div.modal[style*='display: block']"
                 )))
             except TimeoutException:
@@ -342,16 +652,124 @@ def fill_field(driver, wait, xpath, value, field_name):
         logger.error(f"Could not find {field_name} field")
         raise
 
-def data_to_input(driver, no_urut, row_data, is_first_row=False):
+# Set nilai input lewat native setter lalu kirim event yang didengar widget Odoo
+SET_FIELDS_SCRIPT = """
+    var xpaths = arguments[0], values = arguments[1];
+    var setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    for (var i = 0; i < xpaths.length; i++) {
+        var el = document.evaluate(xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (!el) { continue; }
+        el.focus();
+        setter.call(el, values[i]);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+        el.dispatchEvent(new Event('change', {bubbles: true}));
+        el.dispatchEvent(new Event('blur'));
+        el.blur();
+    }
+"""
+
+READ_FIELDS_SCRIPT = """
+    return arguments[0].map(function (xpath) {
+        var el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return el ? el.value : null;
+    });
+"""
+
+def set_fields_fast(driver, wait, fields):
+    """Set plain text/number inputs in one script call and verify them with one read-back.
+
+    Fields whose value did not stick are re-entered with fill_field (keystroke path).
+    Do not use for autocomplete (many2one) fields.
+    """
+    xpaths = [xpath for xpath, _, _ in fields]
+    wait.until(EC.element_to_be_clickable((By.XPATH, xpaths[0])))
+    driver.execute_script(SET_FIELDS_SCRIPT, xpaths, [str(value) for _, value, _ in fields])
+    current_values = driver.execute_script(READ_FIELDS_SCRIPT, xpaths)
+    for (xpath, value, field_name), current in zip(fields, current_values):
+        if str(value) in (current or ''):
+            logger.info(f"{field_name} value entered (fast input): {value}")
+        else:
+            logger.warning(f"{field_name} fast input not reflected ({current!r}), retyping")
+            fill_field(driver, wait, xpath, value, field_name)
+
+# Cache opsi dropdown per sesi WebDriver: {session_id: {field: {value: label}}}
+dropdown_option_cache = {}
+
+def session_options(driver):
+    """Option cache of the driver's current session (rebuilt after a browser restart)"""
+    return dropdown_option_cache.setdefault(driver.session_id, {})
+
+# Klik saran autocomplete dengan label persis; saat belum ada di cache (arguments[1]),
+# pakai saran pertama yang diawali nilai, lalu saran biasa pertama
+PICK_SUGGESTION_SCRIPT = """
+    var wanted = arguments[0].toLowerCase(), discover = arguments[1];
+    var links = Array.prototype.filter.call(document.querySelectorAll('ul.ui-autocomplete li a'),
+        function (a) { return a.getClientRects().length; });
+    var regular = links.filter(function (a) { return !/^(search more|create)/i.test(a.innerText.trim()); });
+    var pick = regular.filter(function (a) { return a.innerText.trim().toLowerCase() === wanted; })[0];
+    if (!pick && discover) {
+        pick = regular.filter(function (a) { return a.innerText.trim().toLowerCase().indexOf(wanted) === 0; })[0] || regular[0];
+    }
+    if (!pick) { return null; }
+    var label = pick.innerText.trim();
+    pick.click();
+    return label;
+"""
+
+def pick_autocomplete_option(driver, field, value):
+    """Click the autocomplete suggestion for value; its label is learned once per session"""
+    options = session_options(driver).setdefault(field, {})
+    label = options.get(value)
+    picked = WebDriverWait(driver, ProcessingConfig.FIELD_WAIT_TIMEOUT, poll_frequency=0.1).until(
+        lambda d: d.execute_script(PICK_SUGGESTION_SCRIPT, label or value, label is None)
+    )
+    if label is None:
+        options[value] = picked
+        logger.info(f"Cached {field} option '{value}' -> '{picked}'")
+    return picked
+
+SELECT_OPTIONS_SCRIPT = """
+    var select = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return select ? Array.prototype.map.call(select.options, function (o) { return [o.value, o.text.trim()]; }) : null;
+"""
+
+SET_SELECT_SCRIPT = """
+    var select = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    select.value = arguments[1];
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    return select.value;
+"""
+
+def set_select_option(driver, wait, xpath, field, label):
+    """Set a <select> by value in one call; the label -> value map is read once per session"""
+    options = session_options(driver)
+    if field not in options:
+        wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
+        pairs = driver.execute_script(SELECT_OPTIONS_SCRIPT, xpath) or []
+        options[field] = {text: value for value, text in pairs}
+        # Perilaku lama: pilihan ke-2 (option[2]) bila label tidak ditemukan
+        if label not in options[field] and len(pairs) > 1:
+            logger.warning(f"{field} option '{label}' not found, using '{pairs[1][1]}'")
+            options[field][label] = pairs[1][0]
+        logger.info(f"Cached {field} options: {list(options[field])}")
+    value = options[field].get(label)
+    if value is None or driver.execute_script(SET_SELECT_SCRIPT, xpath, value) != value:
+        raise NoSuchElementException(f"Could not select '{label}' in {field}")
+
+def data_to_input(driver, no_urut, row_data, is_first_row=False, values=None):
     """Input data to the table row using Excel data"""
-    wait = WebDriverWait(driver, 5)
-    # Determine test age based on sequence number
-    rencana_umur_test = "7" if no_urut in [1, 2] else "28"
-    # Get kode benda uji from Excel (column 3, index 2)
-    kode_benda_uji = str(row_data.iloc[2]) if len(row_data) > 2 else f" Isi Kode Benda Uji - {no_urut}"
-    bentuk_benda_uji = "Silinder 15 x 30 cm"
+    run_blocking(data_to_input_steps(driver, no_urut, row_data, is_first_row, values))
+
+def data_to_input_steps(driver, no_urut, row_data, is_first_row=False, values=None):
+    """Step generator of data_to_input: yields instead of sleeping, and before each autocomplete pick"""
+    wait = WebDriverWait(driver, ProcessingConfig.FIELD_WAIT_TIMEOUT)
+    values = values or derive_row_values(row_data)
+    line = derive_line_values(values, no_urut)
+    rencana_umur_test = line['rencana_umur_test']
+    kode_benda_uji = line['kode_benda_uji']
+    bentuk_benda_uji = line['bentuk_benda_uji']
     logger.info(f"Input Row {no_urut} on data table...")
-    time.sleep(1)
+    yield ProcessingConfig.STEP_DELAY
     # Only click on the first row if it's the first iteration
     if is_first_row:
         first_row = wait.until(EC.element_to_be_clickable(
@@ -381,6 +799,11 @@ def data_to_input(driver, no_urut, row_data, is_first_row=False):
         (f"{base_xpath}/input[2]", kode_benda_uji, "Kode Benda Uji"),
         (f"{base_xpath}/div[1]/div/input", rencana_umur_test, "Rencana Umur Test"),
     ]
+    if ProcessingConfig.FAST_INPUT:
+        # Field teks biasa sekaligus; Rencana Umur Test (autocomplete) tetap diketik
+        set_fields_fast(driver, wait, fields_data[:2])
+        fields_data = fields_data[2:]
+    resumed = False
     for xpath, value, field_name in fields_data:
         logger.info(f"Filling {field_name} with value: {value}")
         field = wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
@@ -388,7 +811,27 @@ def data_to_input(driver, no_urut, row_data, is_first_row=False):
         field.send_keys(Keys.CONTROL, "a")
         field.send_keys(Keys.DELETE)
         field.send_keys(str(value))
-        time.sleep(1)
+        # Rencana Umur Test (terakhir) adalah autocomplete - tab lain bekerja selagi saran dimuat
+        resumed = yield (0 if ProcessingConfig.CACHED_OPTIONS else ProcessingConfig.STEP_DELAY)
+    if resumed:
+        reopen_autocomplete(driver, field)
+
+    if ProcessingConfig.CACHED_OPTIONS:
+        pick_autocomplete_option(driver, "rencana_umur_test", rencana_umur_test)
+
+        logger.info(f"Filling Bentuk Benda Uji field for row {no_urut}...")
+        bentuk_benda_uji_field = driver.find_element(By.CSS_SELECTOR, '[data-fieldname="bentuk_benda_uji"] .o_form_input')
+        bentuk_benda_uji_field.click()
+        bentuk_benda_uji_field.send_keys(Keys.CONTROL, "a")
+        bentuk_benda_uji_field.send_keys(Keys.DELETE)
+        bentuk_benda_uji_field.send_keys(bentuk_benda_uji)
+        if (yield 0):
+            reopen_autocomplete(driver, bentuk_benda_uji_field)
+        pick_autocomplete_option(driver, "bentuk_benda_uji", bentuk_benda_uji)
+
+        logger.info(f"Filling Tempat Pengetesan field for row {no_urut}...")
+        set_select_option(driver, wait, f"{base_xpath}/select", "tempat_pengetesan", line['tempat_pengetesan'])
+        return
 
     wait_for_loading_overlay_to_disappear(driver, wait)
 
@@ -406,28 +849,269 @@ def data_to_input(driver, no_urut, row_data, is_first_row=False):
     bentuk_benda_uji_field.send_keys(Keys.CONTROL, "a")
     bentuk_benda_uji_field.send_keys(Keys.DELETE) 
     bentuk_benda_uji_field.send_keys(bentuk_benda_uji)
-    time.sleep(1)
+    if (yield ProcessingConfig.STEP_DELAY):
+        reopen_autocomplete(driver, bentuk_benda_uji_field)
     silinder_select = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/ul[4]/li[1]/a")))
-    silinder_select.click
-    time.sleep(1)
+    silinder_select.click()
+    yield ProcessingConfig.STEP_DELAY
 
     # Fill Tempat Pengetesan
     logger.info(f"Filling Tempat Pengetesan field for row {no_urut}...")
     tempat_field = wait.until(EC.element_to_be_clickable((By.XPATH, f"{base_xpath}/select")))
     tempat_field.click()
-    time.sleep(1)
+    yield ProcessingConfig.STEP_DELAY
     tempat_internal_select = wait.until(EC.element_to_be_clickable((By.XPATH, f"{base_xpath}/select/option[2]")))
     tempat_internal_select.click()
-    time.sleep(1)
+    yield ProcessingConfig.STEP_DELAY
+
+class CommandProfiler:
+    """Count and time every WebDriver command, attributed to the pipeline step and call site"""
+
+    # Fungsi yang dianggap "langkah" pipeline; helper (fill_field, overlay wait) ikut langkah pemanggilnya
+    STEP_FUNCTIONS = {
+        "login", "navigate_and_create", "open_new_form", "create_form", "fill_proyek_form",
+        "fill_docket_form", "add_table_rows", "data_to_input", "save_form", "duplicate_form",
+        "alternative_form", "update_duplicated_form", "refresh_and_wait", "prepare_for_next_row",
+    }
+
+    # Generator langkah (dipakai scheduler multi-tab) dihitung sebagai langkah aslinya
+    STEP_GENERATORS = {
+        "fill_proyek_steps": "fill_proyek_form", "fill_docket_steps": "fill_docket_form",
+        "select_docket_steps": "fill_docket_form", "fill_form_fields_steps": "fill_docket_form",
+        "add_table_rows_steps": "add_table_rows", "data_to_input_steps": "data_to_input",
+        "duplicate_steps": "duplicate_form", "update_duplicated_steps": "update_duplicated_form",
+    }
+
+    @classmethod
+    def step_name(cls, function_name):
+        """Pipeline step a function belongs to, or None for helpers"""
+        function_name = cls.STEP_GENERATORS.get(function_name, function_name)
+        return function_name if function_name in cls.STEP_FUNCTIONS else None
+
+    def __init__(self):
+        self.enabled = False
+        self.current_row = None
+        self.records = []
+
+    def attach(self, driver):
+        """Wrap driver.execute, through which every driver and element command passes"""
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                self.record(driver_command, time.perf_counter() - started)
+
+        driver.execute = execute
+        return driver
+
+    def record(self, command, elapsed):
+        step, call_site = "other", "other"
+        frame = sys._getframe(2)
+        while frame is not None:
+            if frame.f_globals is globals():
+                name = frame.f_code.co_name
+                if call_site == "other":
+                    call_site = f"{name}:{frame.f_lineno}"
+                name = self.step_name(name)
+                if name:
+                    no_urut = frame.f_locals.get("no_urut") if name == "data_to_input" else None
+                    step = f"{name} row {no_urut}" if no_urut else name
+                    break
+            frame = frame.f_back
+        self.records.append((self.current_row, step, call_site, command, elapsed))
+
+    def report(self, top_n=None):
+        """Log a per-row breakdown and the most expensive call sites; return them as a dict"""
+        top_n = top_n or ProcessingConfig.COMMAND_PROFILE_TOP_N
+        rows, call_sites = {}, {}
+        for row, step, call_site, command, elapsed in self.records:
+            row_stats = rows.setdefault(row, {"commands": 0, "seconds": 0.0, "steps": {}})
+            row_stats["commands"] += 1
+            row_stats["seconds"] += elapsed
+            step_stats = row_stats["steps"].setdefault(step, {"commands": 0, "seconds": 0.0})
+            step_stats["commands"] += 1
+            step_stats["seconds"] += elapsed
+            site_stats = call_sites.setdefault(call_site, {"commands": 0, "seconds": 0.0, "types": {}})
+            site_stats["commands"] += 1
+            site_stats["seconds"] += elapsed
+            site_stats["types"][command] = site_stats["types"].get(command, 0) + 1
+
+        logger_debug("=" * 60)
+        logger_debug(f"WEBDRIVER COMMAND PROFILE ({len(self.records)} commands)")
+        for row, row_stats in rows.items():
+            steps = ", ".join(f"{step} {stats['commands']}/{stats['seconds']:.1f}s"
+                              for step, stats in sorted(row_stats["steps"].items(), key=lambda item: -item[1]["seconds"]))
+            label = f"Row {row}" if row is not None else "Setup"
+            logger_debug(f"{label}: {row_stats['commands']} commands, {row_stats['seconds']:.1f}s - {steps}")
+
+        top_sites = sorted(call_sites.items(), key=lambda item: -item[1]["seconds"])[:top_n]
+        logger_debug(f"Top {len(top_sites)} call sites by WebDriver time:")
+        for call_site, stats in top_sites:
+            types = ", ".join(f"{name} x{count}" for name, count in stats["types"].items())
+            logger_debug(f"  {call_site}: {stats['commands']} commands, {stats['seconds']:.2f}s ({types})")
+        return {"rows": {str(row): stats for row, stats in rows.items()}, "top_call_sites": dict(top_sites)}
+
+
+# Profiler global agar driver hasil recycle ikut ter-instrumentasi
+command_profiler = CommandProfiler()
+
+class SessionRecorder:
+    """Record every WebDriver command with its raw response, plus page snapshots per row"""
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = None
+        self.file = None
+        self.count = 0
+        self.snapshot_row = None
+        self.lock = threading.Lock()
+
+    def start(self, directory, excel_file_path, seed):
+        os.makedirs(os.path.join(directory, "snapshots"), exist_ok=True)
+        shutil.copyfile(excel_file_path, os.path.join(directory, "workbook.xlsx"))
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"seed": seed, "timing": ProcessingConfig.timing(), "recorded_at": datetime.now().isoformat()}, f, indent=2)
+        self.directory = directory
+        self.file = open(os.path.join(directory, "commands.jsonl"), "w", encoding="utf-8")
+        self.enabled = True
+
+    def attach(self, driver):
+        """Wrap the driver's command executor (below element/id wrapping, so responses replay verbatim)"""
+        executor = driver.command_executor
+        original_execute = executor.execute
+
+        def execute(command, params=None):
+            self.snapshot(original_execute, params)
+            started = time.perf_counter()
+            response = original_execute(command, params)
+            self.write(command, params, time.perf_counter() - started, response)
+            return response
+
+        executor.execute = execute
+        return driver
+
+    def snapshot(self, original_execute, params):
+        """Save the page source once per Excel row (not recorded as a command)"""
+        row = command_profiler.current_row
+        if row is None or row == self.snapshot_row or not params or "sessionId" not in params:
+            return
+        self.snapshot_row = row
+        try:
+            source = original_execute("getPageSource", {"sessionId": params["sessionId"]}).get("value") or ""
+            with open(os.path.join(self.directory, "snapshots", f"row_{row:05d}.html"), "w", encoding="utf-8") as f:
+                f.write(source)
+        except Exception as e:
+            logger.warning(f"Snapshot for row {row} failed: {e}")
+
+    def write(self, command, params, elapsed, response):
+        with self.lock:
+            self.file.write(json.dumps({"command": command, "key": replay_key(command, params),
+                                        "elapsed": round(elapsed, 4), "response": response}) + "\n")
+            self.file.flush()
+            self.count += 1
+
+    def stop(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            logger_debug(f"Recorded {self.count} WebDriver commands to {self.directory}")
+        self.enabled = False
+
+
+def replay_key(command, params):
+    """Command plus parameters (without session id) used to match recorded responses"""
+    params = {key: value for key, value in (params or {}).items() if key != "sessionId"}
+    return command + " " + json.dumps(params, sort_keys=True, default=str)
+
+
+class ReplayExecutor:
+    """Stand-in for RemoteConnection that answers from a recording instead of a browser"""
+
+    def __init__(self, entries, clock):
+        self.entries = entries
+        self.clock = clock
+        self.consumed = [False] * len(entries)
+        self.by_key, self.by_command = {}, {}
+        for position, entry in enumerate(entries):
+            self.by_key.setdefault(entry["key"], deque()).append(position)
+            self.by_command.setdefault(entry["command"], deque()).append(position)
+        self.served = 0
+        self.misses = 0
+
+    def _pop(self, positions):
+        while positions and self.consumed[positions[0]]:
+            positions.popleft()
+        if not positions:
+            return None
+        position = positions.popleft()
+        self.consumed[position] = True
+        return self.entries[position]
+
+    def execute(self, command, params=None):
+        if command == "newSession":
+            return {"value": {"sessionId": "replay", "capabilities": {"browserName": "chrome"}}}
+        # Urutan sama persis dulu, lalu respons berikutnya untuk command yang sama
+        entry = self._pop(self.by_key.get(replay_key(command, params), deque()))
+        if entry is None:
+            entry = self._pop(self.by_command.get(command, deque()))
+        if entry is None:
+            self.misses += 1
+            return {"status": 500, "value": {"error": "unknown error", "message": f"replay: no recorded response for {command}"}}
+        self.served += 1
+        self.clock.now += entry["elapsed"]
+        return json.loads(json.dumps(entry["response"]))
+
+    def close(self):
+        pass
+
+
+class SimulatedClock:
+    """Drop-in for the time module during replay: sleeps advance simulated time instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def sleep(self, seconds):
+        self.now += max(seconds, 0)
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+# Recorder global dan executor replay (None = browser sungguhan)
+session_recorder = SessionRecorder()
+replay_executor = None
 
 def setup_driver():
     """Setup Chrome driver"""
+    load_selenium()
+    if replay_executor is not None:
+        driver = webdriver.Remote(command_executor=replay_executor, options=webdriver.ChromeOptions())
+        if command_profiler.enabled:
+            command_profiler.attach(driver)
+        driver.maximize_window()
+        return driver
     chromedriver_path = resource_path("chromedriver.exe")
     service = Service(executable_path=chromedriver_path)
     options = webdriver.ChromeOptions()
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
+    # Console log browser untuk forensik kegagalan
+    options.set_capability("goog:loggingPrefs", {"browser": "ALL"})
     driver = webdriver.Chrome(service=service, options=options)
+    if session_recorder.enabled:
+        session_recorder.attach(driver)
+    if command_profiler.enabled:
+        command_profiler.attach(driver)
     driver.maximize_window()
     return driver
 
@@ -446,7 +1130,7 @@ def login(driver, wait):
     logger.info("Clicking login button...")
     login_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".btn.btn-primary")))
     login_button.click()
-    time.sleep(3)
+    time.sleep(ProcessingConfig.PAGE_LOAD_DELAY)
     logger.info(f"Current URL after login: {driver.current_url}")
 
 def navigate_and_create(driver, wait):
@@ -460,24 +1144,54 @@ def navigate_and_create(driver, wait):
     create_button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[1]/div[2]/div[1]/div/button[1]")))
     create_button.click()
 
-def fill_proyek_form(driver, wait, row_data):
+def run_blocking(steps):
+    """Run a step generator outside the tab scheduler: every yielded delay is slept"""
+    try:
+        delay = next(steps)
+        while True:
+            time.sleep(delay or 0)
+            delay = steps.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+# Fokuskan lagi field dan jalankan ulang pencarian autocomplete bila menunya
+# tertutup (blur) selama tab lain bekerja
+REOPEN_AUTOCOMPLETE_SCRIPT = """
+    var el = arguments[0];
+    el.focus();
+    if (window.jQuery && jQuery(el).data('ui-autocomplete') && !jQuery(el).autocomplete('widget').is(':visible')) {
+        jQuery(el).autocomplete('search');
+    }
+"""
+
+def reopen_autocomplete(driver, field):
+    """Called when a step resumes after other tabs ran between typing and picking"""
+    driver.execute_script(REOPEN_AUTOCOMPLETE_SCRIPT, field)
+
+def fill_proyek_form(driver, wait, row_data, values=None):
     """Fill main form fields using Excel data"""
+    run_blocking(fill_proyek_steps(driver, wait, row_data, values))
+
+def fill_proyek_steps(driver, wait, row_data, values=None):
+    """Step generator of fill_proyek_form: yields the autocomplete wait instead of sleeping"""
+    values = values or derive_row_values(row_data)
     # Date field - from Excel column 1 (index 0)
     wait_for_loading_overlay_to_disappear(driver, wait)
-    tgl_mulai_prod = str(row_data.iloc[0]) if len(row_data) > 0 else "None"
+    tgl_mulai_prod = values['tgl_mulai_prod']
     logger.info(f"Filling Date form with: {tgl_mulai_prod}")
     tgl_field = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[1]/tbody/tr[1]/td[2]/div/input")))
     tgl_field.clear()
     tgl_field.send_keys(tgl_mulai_prod)
     # Proyek field - from Excel column 4 (index 3)
-    proyek = str(row_data.iloc[3]) if len(row_data) > 3 else "-"
+    proyek = values['proyek']
     logger.info(f"Filling Proyek field with: {proyek}")
-    proyek_field = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[1]/tbody/tr[2]/td[2]/div/div/input")))
+    proyek_field = wait.until(EC.element_to_be_clickable((By.XPATH, PROYEK_FIELD_XPATH)))
     proyek_field.clear()
     proyek_field.send_keys(proyek)
-    time.sleep(3)
+    if (yield ProcessingConfig.AUTOCOMPLETE_DELAY):
+        reopen_autocomplete(driver, proyek_field)
     
-    if proyek == "JALAN TOL AKSES PATIMBAN":
+    if values['proyek_option'] == 2:
         proyek_option = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/ul[1]/li[2]")))
         proyek_option.click()
         logger.info("Selected 'JALAN TOL AKSES PATIMBAN' from dropdown")
@@ -489,38 +1203,114 @@ def fill_proyek_form(driver, wait, row_data):
         except TimeoutException:
             logger.error("Proyek dropdown not found")
 
-def fill_docket_form(driver, wait, row_data):
+def fill_docket_form(driver, wait, row_data, values=None):
     """Fill docket form using Excel data"""
+    run_blocking(fill_docket_steps(driver, wait, row_data, values))
+
+def fill_docket_steps(driver, wait, row_data, values=None):
+    """Step generator of fill_docket_form"""
+    values = values or derive_row_values(row_data)
     # No. Docket field - from Excel column 2 (index 1)
     wait_for_loading_overlay_to_disappear(driver, wait)
-    no_docket = str(row_data.iloc[1]) if len(row_data) > 1 else "None"
+    yield from select_docket_steps(driver, wait, values['no_docket'])
+    yield from fill_form_fields_steps(driver, wait, docket_form_fields(values))
+
+def docket_form_fields(values):
+    """(xpath, value, name) of the plain fields below No. Docket"""
+    base_xpath = "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[2]/tbody/tr"
+    return [
+        (f"{base_xpath}[2]/td[2]/input", values['slump_rencana'], "Slump Rencana"),
+        (f"{base_xpath}[3]/td[2]/input", values['slump_test'], "Slump Test"),
+        (f"{base_xpath}[4]/td[2]/input", values['yield_value'], "Yield"),
+        (f"{base_xpath}[5]/td[2]/input", values['nama_teknisi'], "Nama Teknisi"),
+        (f"{base_xpath}[6]/td[2]/input", values['jam_sample'], "Jam Sample")
+    ]
+
+def fill_form_fields(driver, wait, form_fields):
+    """Fill plain fields with fast input or keystrokes"""
+    run_blocking(fill_form_fields_steps(driver, wait, form_fields))
+
+def fill_form_fields_steps(driver, wait, form_fields):
+    """Step generator of fill_form_fields"""
+    if not form_fields:
+        return
+    if ProcessingConfig.FAST_INPUT:
+        set_fields_fast(driver, wait, form_fields)
+        return
+    for xpath, value, field_name in form_fields:
+        yield ProcessingConfig.STEP_DELAY
+        fill_field(driver, wait, xpath, value, field_name)
+
+READ_SUGGESTIONS_SCRIPT = """
+    var links = document.querySelectorAll('ul.ui-autocomplete li a');
+    return Array.prototype.filter.call(links, function (a) { return a.getClientRects().length; })
+        .map(function (a) { return [a, a.innerText.trim()]; });
+"""
+
+def docket_matches(no_docket, text):
+    """True if a displayed docket (possibly "<docket> - <keterangan>") is no_docket"""
+    key, candidate = docket_key(no_docket), docket_key(text)
+    return bool(key) and (candidate == key or candidate.split(" ")[0] == key)
+
+def match_docket_suggestion(no_docket, suggestions):
+    """Return (index of the suggestion matching no_docket or None, near misses [(text, ratio)])"""
+    key = docket_key(no_docket)
+    near_misses = []
+    for index, text in enumerate(suggestions):
+        if docket_matches(no_docket, text):
+            return index, []
+        candidate = docket_key(text)
+        ratio = difflib.SequenceMatcher(None, key, candidate).ratio()
+        if ratio >= ProcessingConfig.DOCKET_NEAR_MISS_RATIO:
+            near_misses.append((text, round(ratio, 2)))
+    return None, near_misses
+
+def select_docket(driver, wait, no_docket):
+    """Type No. Docket and pick it from the autocomplete (or Search more...)"""
+    run_blocking(select_docket_steps(driver, wait, no_docket))
+
+def select_docket_steps(driver, wait, no_docket):
+    """Step generator of select_docket: yields while the autocomplete and search modal load"""
     logger.info(f"Filling No. Docket field with: {no_docket}")
     # Click and fill the No. Docket field
-    no_docket_field = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[1]/tbody/tr[3]/td[2]/div/div/input")))
+    no_docket_field = wait.until(EC.element_to_be_clickable((By.XPATH, DOCKET_FIELD_XPATH)))
     driver.execute_script("arguments[0].scrollIntoView(true);", no_docket_field)
-    time.sleep(1)
+    yield ProcessingConfig.STEP_DELAY
     no_docket_field.click()
     no_docket_field.clear()
     no_docket_field.send_keys(no_docket)
-    time.sleep(3)
+    resumed = yield ProcessingConfig.AUTOCOMPLETE_DELAY
     
     try:
-        time.sleep(1)
-        # Check if the element exists without waiting
-        xpath = f"//ul[@class='ui-autocomplete ui-front ui-menu ui-widget ui-widget-content']//a[text()='{no_docket}']"
-        elements = driver.find_elements(By.XPATH, xpath)
+        resumed = (yield ProcessingConfig.STEP_DELAY) or resumed
+        if resumed:
+            reopen_autocomplete(driver, no_docket_field)
+            try:
+                WebDriverWait(driver, ProcessingConfig.FIELD_WAIT_TIMEOUT, poll_frequency=0.2).until(
+                    lambda d: d.execute_script(READ_SUGGESTIONS_SCRIPT))
+            except TimeoutException:
+                pass
+        # Baca semua saran autocomplete sekaligus, cocokkan dengan key yang dinormalisasi
+        suggestions = driver.execute_script(READ_SUGGESTIONS_SCRIPT) or []
+        match_index, near_misses = match_docket_suggestion(no_docket, [text for _, text in suggestions])
         
-        if elements and elements[0].is_displayed():
+        if match_index is not None:
             # Element found, click it
-            logger.info(f"Found {no_docket} in autocomplete dropdown")
-            elements[0].click()
+            logger.info(f"Found {no_docket} in autocomplete dropdown as '{suggestions[match_index][1]}'")
+            suggestions[match_index][0].click()
             logger.info(f"Successfully clicked on {no_docket} from autocomplete dropdown")
         else:
             logger.info(f"Element with text '{no_docket}' not found in autocomplete dropdown")
+            if near_misses:
+                logger_debug(f"DOCKET NEAR MISS - No. Docket '{no_docket}' vs autocomplete: "
+                             + ", ".join(f"'{text}' ({ratio})" for text, ratio in near_misses))
             logger.info("Using 'Search more...' option as fallback")
             # Search more option
-            search_more = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/ul[2]/li[8]/a")))
-            search_more.click()
+            search_more = [element for element, text in suggestions if text.lower().startswith("search more")]
+            if search_more:
+                search_more[0].click()
+            else:
+                wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/ul[2]/li[8]/a"))).click()
             # Search in modal
             modal = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".modal-content")))
             try:
@@ -533,33 +1323,17 @@ def fill_docket_form(driver, wait, row_data):
             search_input.send_keys(Keys.ENTER)
             # Wait for search results and select
             wait.until(EC.visibility_of_element_located((By.XPATH, f"//div[contains(@class,'modal-content')]//div[contains(@class,'o_searchview_facet')][.//span[contains(@class,'o_searchview_facet_label')][normalize-space()='No. Docket']]//div[contains(@class,'o_facet_values')]//span[contains(normalize-space(), \"{no_docket}\")]")))
-            time.sleep(3)
+            yield ProcessingConfig.AUTOCOMPLETE_DELAY
             select_first_row_in_modal_and_confirm(driver, wait, row_text=no_docket)   
     except Exception as e:
         logger.error(f"Error in docket selection: {str(e)}")
 
-    # Fill remaining fields using Excel data
-    slump_value = str(row_data.iloc[6]) if len(row_data) > 6 else "10" # Column 7 (index 6)
-    slump_rencana = "12" if "12.0" in slump_value else "10"
-    slump_test = generate_random_slump_test(slump_rencana)
-    yield_value = generate_random_yield()
-    nama_teknisi = str(row_data.iloc[4]) if len(row_data) > 4 else "TEKNISI"  # Column 5 (index 4)
-    base_jam = str(row_data.iloc[8]) if len(row_data) > 8 else "10:30"  # Column 9 (index 8)
-    jam_sample = calculate_jam_sample(base_jam)
-    base_xpath = "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[2]/tbody/tr"
-    form_fields = [
-        (f"{base_xpath}[2]/td[2]/input", slump_rencana, "Slump Rencana"),
-        (f"{base_xpath}[3]/td[2]/input", slump_test, "Slump Test"),
-        (f"{base_xpath}[4]/td[2]/input", yield_value, "Yield"),
-        (f"{base_xpath}[5]/td[2]/input", nama_teknisi, "Nama Teknisi"),
-        (f"{base_xpath}[6]/td[2]/input", jam_sample, "Jam Sample")
-    ]
-    for xpath, value, field_name in form_fields:
-        time.sleep(1)
-        fill_field(driver, wait, xpath, value, field_name)
-
-def add_table_rows(driver, wait, row_data):
+def add_table_rows(driver, wait, row_data, values=None):
     """Add and fill table rows using Excel data"""
+    run_blocking(add_table_rows_steps(driver, wait, row_data, values))
+
+def add_table_rows_steps(driver, wait, row_data, values=None):
+    """Step generator of add_table_rows: yields between and inside sample lines"""
     logger.info("Processing table rows...")
     
     # Check how many existing rows with data-id^='one2many_v_id' exist
@@ -573,7 +1347,7 @@ def add_table_rows(driver, wait, row_data):
         rows_to_delete = existing_count - 4
         deleted_count = quick_delete_excess_rows(driver, rows_to_delete)
         logger.info(f"Deleted {deleted_count} excess rows")
-        time.sleep(1)
+        yield ProcessingConfig.STEP_DELAY
         # Recheck existing count after deletion
         existing_rows = driver.find_elements(By.CSS_SELECTOR, "tr[data-id^='one2many_v_id_']")
         existing_count = len(existing_rows)
@@ -589,24 +1363,96 @@ def add_table_rows(driver, wait, row_data):
         # Fill existing rows in order
         for no_urut in range(1, existing_count + 1):
             logger.info(f"Filling existing row {no_urut}...")
-            data_to_input(driver, no_urut, row_data, is_first_row=(no_urut == 1))
+            yield from data_to_input_steps(driver, no_urut, row_data, is_first_row=(no_urut == 1), values=values)
         
         # Add and fill remaining rows using add item link
         for no_urut in range(existing_count + 1, 5):
             logger.info(f"Adding new row {no_urut}...")
             add_item_link.click()
-            time.sleep(1)  # Wait for row to be added
-            data_to_input(driver, no_urut, row_data, is_first_row=False)
+            yield ProcessingConfig.STEP_DELAY  # Wait for row to be added
+            yield from data_to_input_steps(driver, no_urut, row_data, is_first_row=False, values=values)
     else:
         # If exactly 4 rows exist, just fill them
         logger.info("Exactly 4 rows exist, filling existing rows...")
         for no_urut in range(1, 5):
             logger.info(f"Filling row {no_urut}...")
-            data_to_input(driver, no_urut, row_data, is_first_row=(no_urut == 1))
-
-def save_form(driver, wait):
-    """Save the form"""
-    time.sleep(2)
+            yield from data_to_input_steps(driver, no_urut, row_data, is_first_row=(no_urut == 1), values=values)
+
+class SaveValidationError(Exception):
+    """Odoo refused or did not persist a save (warning dialog text or read-back mismatch)"""
+
+    def __init__(self, message, record_id=None):
+        super().__init__(message)
+        self.message = message
+        self.record_id = record_id
+
+
+# Satu kali baca status form setelah Save: tersimpan (readonly + id), error dialog, atau belum
+SAVE_STATE_SCRIPT = """
+    var dialogs = document.querySelectorAll('.modal.in, .modal.show, .o_notification.o_error');
+    for (var i = 0; i < dialogs.length; i++) {
+        if (dialogs[i].getClientRects().length) {
+            var title = dialogs[i].querySelector('.modal-title, .o_notification_title');
+            var body = dialogs[i].querySelector('.modal-body, .o_notification_content');
+            return {state: 'error', message: [title ? title.innerText : '', body ? body.innerText : dialogs[i].innerText]
+                .filter(function (text) { return text; }).join(': ').trim()};
+        }
+    }
+    var match = /[#&]id=(\\d+)/.exec(window.location.hash);
+    if (!match || !document.querySelector('.o_form_view.o_form_readonly, .oe_form_readonly')) { return null; }
+    var docket = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return {
+        state: 'saved',
+        id: parseInt(match[1], 10),
+        docket: docket ? docket.innerText.trim() : null,
+        lines: document.querySelectorAll('.o_form_view table.o_list_view tbody tr[data-id]').length
+    };
+"""
+DOCKET_CELL_XPATH = "/html/body/div[1]/div/div[2]/div/div/div/div/div[1]/table[1]/tbody/tr[3]/td[2]"
+
+def confirm_save(driver, values=None):
+    """Wait until the form leaves edit mode with a record id; return the id.
+
+    Raises SaveValidationError with the dialog text when Odoo shows a warning,
+    or when the read-back docket / line count does not match `values`.
+    """
+    state = WebDriverWait(driver, ProcessingConfig.WAIT_TIMEOUT, poll_frequency=0.2).until(
+        lambda d: d.execute_script(SAVE_STATE_SCRIPT, DOCKET_CELL_XPATH)
+    )
+    if state['state'] == 'error':
+        raise SaveValidationError(state['message'] or "Unknown Odoo warning")
+
+    record_id = state['id']
+    if ProcessingConfig.SAVE_READBACK and values:
+        if not docket_matches(values['no_docket'], state['docket'] or ''):
+            raise SaveValidationError(f"Read-back docket '{state['docket']}' != '{values['no_docket']}'", record_id)
+        if state['lines'] != 4:
+            raise SaveValidationError(f"Read-back found {state['lines']} sample lines instead of 4", record_id)
+    logger.info(f"Save confirmed - record id {record_id}")
+    return record_id
+
+def saved_needs_review_note(error):
+    """Message for a record that was stored but failed read-back (SaveValidationError with record_id)"""
+    return f"Saved as record {error.record_id} but needs review: {error.message}"
+
+def note_needs_review(results, row_number, no_docket, note):
+    """Keep a saved row whose read-back did not match for the summary"""
+    review_info = create_error_info(row_number, no_docket, note)
+    results.setdefault('review_rows', []).append(review_info)
+    logger.warning(f"Row {row_number} saved but needs review - No. Docket: {no_docket} - {note}")
+    logger_debug(f"Row {row_number} saved but needs review - No. Docket: {no_docket} - {note}")
+
+def save_form(driver, wait, values=None):
+    """Save the form and confirm it was stored (returns the record id when confirmed)"""
+    click_save(driver, wait)
+    if not ProcessingConfig.CONFIRM_SAVE:
+        time.sleep(ProcessingConfig.SAVE_DELAY)
+        return None
+    return confirm_save(driver, values)
+
+def click_save(driver, wait):
+    """Click Save without waiting for the server to finish"""
+    time.sleep(2 * ProcessingConfig.STEP_DELAY)
     tablist = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[2]/div/div/div/div/div[2]/ul")))
     tablist.click()
     wait_for_loading_overlay_to_disappear(driver, wait)
@@ -614,43 +1460,146 @@ def save_form(driver, wait):
     save_button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[1]/div[2]/div[1]/div/div[2]/button[1]")))
     logger.info("Save button found, clicking...")
     save_button.click()
-    time.sleep(3)
 
 def create_form(wait):
     """Create new form"""
     logger.info("Creating new form...")
-    create_button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[1]/div[2]/div[1]/div/div[1]/button[2]")))
+    create_button = wait.until(EC.element_to_be_clickable((By.XPATH, FORM_CREATE_BUTTON_XPATH)))
     logger.info("Create button found, clicking...")
     create_button.click()
 
-def duplicate_form(driver, wait, next_row_data):
+def is_new_form_ready(driver):
+    """Check (in one script call) that an empty, editable new-record form is open"""
+    return bool(driver.execute_script("""
+        var form = document.querySelector('.o_form_view.o_form_editable, .oe_form_editable');
+        if (!form || /[#&]id=\\d+/.test(window.location.hash)) { return false; }
+        var proyek = document.evaluate(arguments[0], document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return !!proyek && !proyek.value;
+    """, PROYEK_FIELD_XPATH))
+
+def open_new_form(driver, wait, warm=True):
+    """Open an empty form, reusing the in-app form view when possible (warm-form mode).
+
+    Falls back to navigate_and_create (full web client reload) when the
+    form state cannot be recovered.
+    """
+    if warm and ProcessingConfig.WARM_FORM:
+        try:
+            wait_for_loading_overlay_to_disappear(driver, wait)
+            if is_new_form_ready(driver):
+                logger.info("Warm form: new form already open, skipping page load")
+                return "warm"
+            if driver.find_elements(By.XPATH, FORM_CREATE_BUTTON_XPATH):
+                create_form(wait)
+                wait_for_loading_overlay_to_disappear(driver, wait)
+                WebDriverWait(driver, ProcessingConfig.FIELD_WAIT_TIMEOUT).until(is_new_form_ready)
+                logger.info("Warm form: new form opened with in-app Create")
+                return "warm"
+        except (TimeoutException, WebDriverException) as e:
+            logger.warning(f"Warm form not recoverable, falling back to full reload: {e}")
+    navigate_and_create(driver, wait)
+    return "reload"
+
+def duplicate_form(driver, wait, next_row_data, values=None):
     """Duplicate form for next entry with same kode_benda_uji and proyek"""
+    run_blocking(duplicate_steps(driver, wait, next_row_data, values))
+
+def duplicate_steps(driver, wait, next_row_data, values=None):
+    """Step generator of duplicate_form: yields while the action menu and the copy load"""
     wait_for_loading_overlay_to_disappear(driver, wait)
     logger.info("Duplicating Rencana Benda Uji...")
     action_button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[1]/div[2]/div[2]/div/div[2]/button")))
     action_button.click()
-    time.sleep(1)
+    yield ProcessingConfig.STEP_DELAY
     duplicate_button = wait.until(EC.element_to_be_clickable((By.XPATH, "/html/body/div[1]/div/div[1]/div[2]/div[2]/div/div[2]/ul/li/a")))
     logger.info("Duplicate button found, clicking...")
     duplicate_button.click()
-    time.sleep(2)
+    yield ProcessingConfig.DUPLICATE_DELAY
     # Update the duplicated form with next row data
     logger.info("Updating duplicated form with next row data...")
-    fill_docket_form(driver, wait, next_row_data)
+    if ProcessingConfig.DIFF_DUPLICATE:
+        yield from update_duplicated_steps(driver, wait, next_row_data, values)
+        return
+    yield from fill_docket_steps(driver, wait, next_row_data, values)
     logger.info("Input data to the table row using Excel data")
-    add_table_rows(driver, wait, next_row_data)
+    yield from add_table_rows_steps(driver, wait, next_row_data, values)
 
-def alternative_form(driver, wait, next_row_data):
+# Baca docket, field header, dan sel baris sampel form hasil duplicate dalam satu call
+READ_FORM_STATE_SCRIPT = """
+    function byXpath(xpath) {
+        return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    var docket = byXpath(arguments[0]);
+    var rows = document.querySelectorAll('.o_form_view table.o_list_view tbody tr[data-id]');
+    return {
+        docket: docket ? docket.value : null,
+        fields: arguments[1].map(function (xpath) { var el = byXpath(xpath); return el ? el.value : null; }),
+        lines: Array.prototype.map.call(rows, function (row) {
+            var cells = {};
+            row.querySelectorAll('td[data-field]').forEach(function (td) {
+                cells[td.getAttribute('data-field')] = td.innerText.trim();
+            });
+            return cells;
+        })
+    };
+"""
+
+def cell_matches(expected, text):
+    """Compare an expected value with a displayed cell/input text"""
+    expected = str(expected).strip().lower()
+    text = (text or "").strip().lower()
+    return text == expected or text.split(" ")[0] == expected
+
+def update_duplicated_form(driver, wait, row_data, values):
+    """Write only the fields and sample lines of a duplicated form that differ from the row"""
+    run_blocking(update_duplicated_steps(driver, wait, row_data, values))
+
+def update_duplicated_steps(driver, wait, row_data, values):
+    """Step generator of update_duplicated_form"""
+    wait_for_loading_overlay_to_disappear(driver, wait)
+    form_fields = docket_form_fields(values)
+    state = driver.execute_script(READ_FORM_STATE_SCRIPT, DOCKET_FIELD_XPATH, [xpath for xpath, _, _ in form_fields])
+
+    if not cell_matches(values['no_docket'], state['docket']):
+        yield from select_docket_steps(driver, wait, values['no_docket'])
+    changed_fields = [field for field, current in zip(form_fields, state['fields']) if not cell_matches(field[1], current)]
+    logger.info(f"Duplicate diff: {len(changed_fields)}/{len(form_fields)} fields changed")
+    yield from fill_form_fields_steps(driver, wait, changed_fields)
+
+    if len(state['lines']) != 4:
+        logger.info(f"Duplicate diff: {len(state['lines'])} sample lines, re-entering all")
+        yield from add_table_rows_steps(driver, wait, row_data, values)
+        return
+    line_columns = ProcessingConfig.DUPLICATE_LINE_COLUMNS
+    missing = sorted({column for cells in state['lines'] for column in line_columns.values() if column not in cells})
+    if missing:
+        logger.info(f"Duplicate diff: sample line columns {missing} not shown, re-entering all")
+        yield from add_table_rows_steps(driver, wait, row_data, values)
+        return
+    changed_lines = []
+    for no_urut, cells in enumerate(state['lines'], start=1):
+        expected = derive_line_values(values, no_urut)
+        if any(not cell_matches(expected[key], cells[column]) for key, column in line_columns.items()):
+            changed_lines.append(no_urut)
+    logger.info(f"Duplicate diff: sample lines to update {changed_lines or 'none'}")
+    for no_urut in changed_lines:
+        yield from data_to_input_steps(driver, no_urut, row_data, is_first_row=(no_urut == 1), values=values)
+
+def alternative_form(driver, wait, next_row_data, values=None):
     # Update the duplicated form with next row data
     wait_for_loading_overlay_to_disappear(driver, wait)
     logger.info("Updating duplicated form with next row data...")
-    fill_docket_form(driver, wait, next_row_data)
+    fill_docket_form(driver, wait, next_row_data, values)
     logger.info("Input data to the table row using Excel data")
-    add_table_rows(driver, wait, next_row_data)
+    add_table_rows(driver, wait, next_row_data, values)
 
 
-def wait_for_loading_overlay_to_disappear(driver, wait, max_wait=20):
-    """Wait for blockUI loading overlay to disappear"""
+def wait_for_loading_overlay_to_disappear(driver, wait, max_wait=None):
+    """Wait for blockUI loading overlay to disappear (max_wait seconds in total)"""
+    if max_wait is None:
+        max_wait = ProcessingConfig.OVERLAY_MAX_WAIT
+    deadline = time.monotonic() + max_wait
     try:
         loading_selectors = [
             "div.blockUI.blockMsg.blockPage",
@@ -659,7 +1608,8 @@ def wait_for_loading_overlay_to_disappear(driver, wait, max_wait=20):
         ]
         for selector in loading_selectors:
             try:
-                wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, selector)))
+                remaining = max(deadline - time.monotonic(), 0.1)
+                WebDriverWait(driver, remaining).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, selector)))
             except:
                 pass
         time.sleep(0.5)
@@ -668,75 +1618,272 @@ def wait_for_loading_overlay_to_disappear(driver, wait, max_wait=20):
         logger.warning(f"Error waiting for loading overlay: {e}")
         return False
 
+class BrowserSessionLost(Exception):
+    """The WebDriver session died (Chrome/chromedriver crash); row_index is the interrupted row"""
+
+    def __init__(self, message, row_index=None):
+        super().__init__(message)
+        self.row_index = row_index
+
+
+class BrowserUnavailable(Exception):
+    """No working browser can be provided (respawn limit reached or restart failed)"""
+
+
+DEAD_SESSION_MARKERS = (
+    "invalid session id", "session deleted", "no such session", "chrome not reachable",
+    "disconnected", "no such window", "target window already closed", "connection refused",
+    "max retries exceeded", "failed to establish a new connection", "remote end closed",
+)
+
+@contextmanager
+def session_guard(driver, row_index):
+    """Recovery steps (refresh, reopen) outside a row's try: a dead browser becomes BrowserSessionLost"""
+    try:
+        yield
+    except BrowserSessionLost:
+        raise
+    except Exception as e:
+        if is_session_dead(driver, e):
+            raise BrowserSessionLost(str(e), row_index) from e
+        raise
+
+def is_session_dead(driver, error=None):
+    """Tell a dead browser session apart from a page-level error"""
+    if error is not None and any(marker in str(error).lower() for marker in DEAD_SESSION_MARKERS):
+        return True
+    try:
+        driver.current_url
+        return False
+    except UnexpectedAlertPresentException:
+        return False
+    except Exception:
+        return True
+
 def is_click_intercepted_error(error_message):
     """Check if error is due to element click intercepted"""
     error_str = str(error_message).lower()
     return "element click intercepted" in error_str and ("blockui" in error_str or "blockoverlay" in error_str)
 
+class CircuitBreaker:
+    """Stop spending retries on systemic failures.
+
+    Every attempt is recorded as success or as an error class
+    ("ExceptionType@step"). When one class reaches BREAKER_THRESHOLD of the
+    last BREAKER_WINDOW attempts the breaker opens: retries stop, and the run
+    pauses (or defers rows, BREAKER_ACTION = "skip") until a probe row
+    succeeds. Failed probes back off up to BREAKER_PROBE_MAX seconds.
+    """
+
+    def __init__(self):
+        self.window = deque()
+        self.open_class = None
+        self.next_probe = None
+        self.probe_interval = None
+        self.probe_started = None
+        self.trips = []
+
+    def classify(self, driver, error):
+        """Error type plus the innermost pipeline step it was raised in"""
+        error_type = type(error).__name__
+        try:
+            if "/web/login" in driver.current_url:
+                error_type = "SessionExpired"
+        except Exception:
+            pass
+        step = "unknown"
+        tb = error.__traceback__
+        while tb is not None:
+            frame = tb.tb_frame
+            if frame.f_globals is globals() and CommandProfiler.step_name(frame.f_code.co_name):
+                step = CommandProfiler.step_name(frame.f_code.co_name)
+            tb = tb.tb_next
+        return f"{error_type}@{step}"
+
+    def _append(self, entry):
+        self.window.append(entry)
+        while len(self.window) > ProcessingConfig.BREAKER_WINDOW:
+            self.window.popleft()
+
+    def record_success(self):
+        self._append(None)
+        if self.open_class is not None:
+            trip = self.trips[-1]
+            trip['recovered_at'] = datetime.now().strftime("%H:%M:%S")
+            logger_debug(f"CIRCUIT BREAKER closed: {self.open_class} recovered after {trip['probes']} probe(s)")
+            self.open_class = self.probe_started = None
+            self.window.clear()
+
+    def record_failure(self, driver, error):
+        error_class = self.classify(driver, error)
+        self._append(error_class)
+        if self.probe_started is not None:
+            self._probe_failed(error_class)
+        elif self.open_class is None:
+            attempts = len(self.window)
+            rate = self.window.count(error_class) / attempts
+            if attempts >= ProcessingConfig.BREAKER_MIN_ATTEMPTS and rate >= ProcessingConfig.BREAKER_THRESHOLD:
+                self._trip(error_class, rate, attempts, error)
+        return error_class
+
+    def _trip(self, error_class, rate, attempts, error):
+        self.open_class = error_class
+        self.probe_interval = ProcessingConfig.BREAKER_PROBE_INTERVAL
+        self.next_probe = time.time() + self.probe_interval
+        message = str(error).splitlines()[0] if str(error) else ""
+        self.trips.append({
+            'error_class': error_class, 'rate': rate, 'attempts': attempts, 'sample': message[:200],
+            'opened_at': datetime.now().strftime("%H:%M:%S"), 'probes': 0, 'recovered_at': None,
+            'action': ProcessingConfig.BREAKER_ACTION,
+        })
+        logger_debug(f"CIRCUIT BREAKER open: {error_class} in {rate:.0%} of last {attempts} attempts "
+                     f"({message[:120]}) - {ProcessingConfig.BREAKER_ACTION} until probe in {self.probe_interval}s")
+
+    def _probe_failed(self, error_class):
+        self.probe_started = None
+        self.probe_interval = min(self.probe_interval * 2, ProcessingConfig.BREAKER_PROBE_MAX)
+        self.next_probe = time.time() + self.probe_interval
+        logger_debug(f"CIRCUIT BREAKER probe failed ({error_class}) - next probe in {self.probe_interval}s")
+
+    def is_open(self):
+        """True while retries should not be spent (open, or a probe just failed)"""
+        return self.open_class is not None and self.probe_started is None
+
+    def gate(self):
+        """'run', 'probe' (try one row), or the configured 'pause' / 'skip' while open"""
+        if self.open_class is None:
+            return "run"
+        if self.probe_started is not None:
+            # Probe yang tidak pernah melapor (mis. browser di-respawn) dianggap gagal
+            if time.time() - self.probe_started < ProcessingConfig.BREAKER_PROBE_MAX:
+                return "pause"
+            self._probe_failed("no result")
+        if time.time() >= self.next_probe:
+            self.probe_started = time.time()
+            self.trips[-1]['probes'] += 1
+            return "probe"
+        return ProcessingConfig.BREAKER_ACTION
+
+    def prepare_probe(self, driver, wait):
+        """Re-login first when the session expired, so the probe can actually succeed"""
+        logger_debug(f"CIRCUIT BREAKER probing {self.open_class}")
+        if self.open_class.startswith("SessionExpired"):
+            try:
+                login(driver, wait)
+            except Exception as e:
+                logger.warning(f"Re-login before probe failed: {e}")
+
+    def seconds_until_probe(self):
+        return max(self.next_probe - time.time(), 0) if self.next_probe else 0
+
+    def pause_seconds(self):
+        """How long a paused run waits before asking gate() again"""
+        if self.probe_started is not None:
+            # Probe sedang berjalan (di tab lain) - cek ulang berkala, jangan spin
+            return ProcessingConfig.BREAKER_POLL_INTERVAL
+        return max(self.seconds_until_probe(), ProcessingConfig.BREAKER_POLL_INTERVAL)
+
+    def session_lost(self):
+        """The browser died: an outstanding probe will never report, count it as failed"""
+        if self.probe_started is not None:
+            self._probe_failed("session lost")
+
+    def reason(self):
+        return f"Circuit breaker open: {self.open_class} - not retried"
+
+
+# Circuit breaker global per kelas error
+circuit_breaker = CircuitBreaker()
+
 def refresh_and_wait(driver, wait):
     """Refresh page and wait for it to load"""
     logger.info("Refreshing page...")
     driver.refresh()
-    time.sleep(3)
+    time.sleep(ProcessingConfig.PAGE_LOAD_DELAY)
     wait_for_loading_overlay_to_disappear(driver, wait)
-    time.sleep(2)
+    time.sleep(2 * ProcessingConfig.STEP_DELAY)
 
 def process_excel_row_with_retry(driver, wait, excel_processor, row_data, row_index, max_retries=3):
     """Process single Excel row with retry logic for click intercepted errors"""
     no_docket = row_data.get('No. Docket', 'Unknown')
-    logger.info(f"Processing Excel row {row_index + 1} - No. Docket: {no_docket}")
+    row_number = excel_processor.source_row(row_index)
+    logger.info(f"Processing Excel row {row_number} - No. Docket: {no_docket}")
+    values = excel_processor.get_prepared_row(row_index)
 
     for attempt in range(max_retries):
         try:
-            navigate_and_create(driver, wait)
+            # Percobaan pertama memakai form yang sudah terbuka; retry selalu reload penuh
+            open_new_form(driver, wait, warm=(attempt == 0))
 
             wait_for_loading_overlay_to_disappear(driver, wait)
-            fill_proyek_form(driver, wait, row_data)
+            fill_proyek_form(driver, wait, row_data, values)
 
             wait_for_loading_overlay_to_disappear(driver, wait)
-            fill_docket_form(driver, wait, row_data)
+            fill_docket_form(driver, wait, row_data, values)
 
             wait_for_loading_overlay_to_disappear(driver, wait)
-            add_table_rows(driver, wait, row_data)
+            add_table_rows(driver, wait, row_data, values)
 
-            save_form(driver, wait)
-            logger.info(f"Success processing row {row_index + 1}: No. Docket {no_docket}")
+            save_form(driver, wait, values)
+            circuit_breaker.record_success()
+            logger.info(f"Success processing row {row_number}: No. Docket {no_docket}")
             return True, no_docket, ""
             
+        except SaveValidationError as e:
+            if e.record_id is not None:
+                circuit_breaker.record_success()
+                return True, no_docket, saved_needs_review_note(e)
+            # Ditolak server - retry tidak akan membantu
+            circuit_breaker.record_failure(driver, e)
+            return False, no_docket, f"Odoo validation error: {e.message}"
+
         except ElementClickInterceptedException as e:
+            circuit_breaker.record_failure(driver, e)
+            if circuit_breaker.is_open():
+                return False, no_docket, circuit_breaker.reason()
             error_message = str(e)
             if is_click_intercepted_error(error_message):
-                logger.warning(f"Click intercepted on attempt {attempt + 1}/{max_retries} for row {row_index + 1} (No. Docket: {no_docket})")
+                logger.warning(f"Click intercepted on attempt {attempt + 1}/{max_retries} for row {row_number} (No. Docket: {no_docket})")
                 
                 if attempt < max_retries - 1:
+                    progress_tracker.record_retry()
                     logger.info(f"Retrying after refresh for No. Docket: {no_docket}")
-                    refresh_and_wait(driver, wait)
+                    with session_guard(driver, row_index):
+                        refresh_and_wait(driver, wait)
                     continue
                 else:
-                    logger.error(f"Max retries reached for row {row_index + 1} (No. Docket: {no_docket}). Skipping...")
+                    logger.error(f"Max retries reached for row {row_number} (No. Docket: {no_docket}). Skipping...")
                     return False, no_docket, f"Click intercepted after {max_retries} attempts"
             else:
                 # Not a blockUI error, don't retry
                 return False, no_docket, error_message
                 
         except Exception as e:
+            if is_session_dead(driver, e):
+                raise BrowserSessionLost(str(e), row_index) from e
+            circuit_breaker.record_failure(driver, e)
+            if circuit_breaker.is_open():
+                return False, no_docket, circuit_breaker.reason()
             error_message = str(e)
-            logger.warning(f"Click intercepted detected on attempt {attempt + 1}/{max_retries} for row {row_index + 1}")
+            logger.warning(f"Click intercepted detected on attempt {attempt + 1}/{max_retries} for row {row_number}")
                 
             if attempt < max_retries - 1:
+                progress_tracker.record_retry()
                 logger.info(f"Retrying after refresh for No. Docket: {no_docket}")
-                refresh_and_wait(driver, wait)
+                with session_guard(driver, row_index):
+                    refresh_and_wait(driver, wait)
                 continue
             else:
-                logger.error(f"Max retries reached for row {row_index + 1}. Skipping...")
+                logger.error(f"Max retries reached for row {row_number}. Skipping...")
                 return False, no_docket, f"Click intercepted after {max_retries} attempts"
             
     return False, no_docket, "Unknown error after all retries"
 
-def process_duplicate_row_with_retry(driver, wait, next_row_data, next_row_index, max_retries=3):
+def process_duplicate_row_with_retry(driver, wait, next_row_data, next_row_index, max_retries=3, values=None):
     """Process next row using duplicate form with retry logic"""
     no_docket = next_row_data.get('No. Docket', 'Unknown')
-    logger.info(f"Processing row {next_row_index + 1} using duplicate form - No. Docket: {no_docket}")
+    row_number = values['row_number'] if values else next_row_index + 1
+    logger.info(f"Processing row {row_number} using duplicate form - No. Docket: {no_docket}")
     
     # Flag untuk mengontrol dua opsi fungsi
     use_duplicate = True
@@ -746,26 +1893,39 @@ def process_duplicate_row_with_retry(driver, wait, next_row_data, next_row_index
             # DUA OPSI: duplicate_form atau alternative_form
             if use_duplicate:
                 logger.info(f"Using duplicate_form on attempt {attempt + 1}")
-                duplicate_form(driver, wait, next_row_data)
+                duplicate_form(driver, wait, next_row_data, values)
             else:
                 logger.info(f"Using alternative_form on attempt {attempt + 1}")
-                alternative_form(driver, wait, next_row_data)
+                alternative_form(driver, wait, next_row_data, values)
             
             # Selalu panggil save_form setelah form processing
-            save_form(driver, wait)
-            logger.info(f"Success processing row {next_row_index + 1}: No. Docket {no_docket}")
+            save_form(driver, wait, values)
+            circuit_breaker.record_success()
+            logger.info(f"Success processing row {row_number}: No. Docket {no_docket}")
             return True, no_docket, ""
             
+        except SaveValidationError as e:
+            if e.record_id is not None:
+                circuit_breaker.record_success()
+                return True, no_docket, saved_needs_review_note(e)
+            circuit_breaker.record_failure(driver, e)
+            return False, no_docket, f"Odoo validation error: {e.message}"
+
         except ElementClickInterceptedException as e:
+            circuit_breaker.record_failure(driver, e)
+            if circuit_breaker.is_open():
+                return False, no_docket, circuit_breaker.reason()
             error_message = str(e)
             if is_click_intercepted_error(error_message):
-                logger.warning(f"Click intercepted on attempt {attempt + 1}/{max_retries} for row {next_row_index + 1}")
+                logger.warning(f"Click intercepted on attempt {attempt + 1}/{max_retries} for row {row_number}")
                 
                 if attempt < max_retries - 1:
+                    progress_tracker.record_retry()
                     logger.info(f"Retrying after refresh for No. Docket: {no_docket}")
-                    refresh_and_wait(driver, wait)
-                    navigate_and_create(driver, wait)
-                    fill_proyek_form(driver, wait, next_row_data)
+                    with session_guard(driver, next_row_index):
+                        refresh_and_wait(driver, wait)
+                        navigate_and_create(driver, wait)
+                        fill_proyek_form(driver, wait, next_row_data, values)
                     
                     # SWITCH STRATEGI: Jika duplicate gagal, gunakan alternative
                     if use_duplicate:
@@ -774,20 +1934,27 @@ def process_duplicate_row_with_retry(driver, wait, next_row_data, next_row_index
                     
                     continue  # Kembali ke awal loop dengan strategi baru
                 else:
-                    logger.error(f"Max retries reached for row {next_row_index + 1}. Skipping...")
+                    logger.error(f"Max retries reached for row {row_number}. Skipping...")
                     return False, no_docket, f"Click intercepted after {max_retries} attempts"
             else:
                 return False, no_docket, error_message
                 
         except Exception as e:
+            if is_session_dead(driver, e):
+                raise BrowserSessionLost(str(e), next_row_index) from e
+            circuit_breaker.record_failure(driver, e)
+            if circuit_breaker.is_open():
+                return False, no_docket, circuit_breaker.reason()
             error_message = str(e)
             logger.warning(f"Click intercepted detected on attempt {attempt + 1}/{max_retries}")
                 
             if attempt < max_retries - 1:
+                progress_tracker.record_retry()
                 logger.info(f"Retrying after refresh for No. Docket: {no_docket}")
-                refresh_and_wait(driver, wait)
-                navigate_and_create(driver, wait)
-                fill_proyek_form(driver, wait, next_row_data)
+                with session_guard(driver, next_row_index):
+                    refresh_and_wait(driver, wait)
+                    navigate_and_create(driver, wait)
+                    fill_proyek_form(driver, wait, next_row_data, values)
                     
                     # SWITCH STRATEGI: Dari duplicate ke alternative
                 if use_duplicate:
@@ -796,7 +1963,7 @@ def process_duplicate_row_with_retry(driver, wait, next_row_data, next_row_index
                     
                 continue  # Kembali ke loop dengan fungsi berbeda
             else:
-                logger.error(f"Max retries reached for row {next_row_index + 1}. Skipping...")
+                logger.error(f"Max retries reached for row {row_number}. Skipping...")
                 return False, no_docket, f"Click intercepted after {max_retries} attempts"
     
     return False, no_docket, "Unknown error after all retries"
@@ -805,7 +1972,7 @@ def prepare_for_next_row(driver, wait, excel_processor, row_index):
     """Prepare for next row - either duplicate or create new form"""
     try:
         wait_for_loading_overlay_to_disappear(driver, wait)
-        if excel_processor.should_duplicate(row_index):
+        if excel_processor.get_prepared_row(row_index)['duplicate_next']:
             logger.info("Next row has same kode_benda_uji and proyek - will use duplicate")
             return "duplicate"
         else:
@@ -814,10 +1981,11 @@ def prepare_for_next_row(driver, wait, excel_processor, row_index):
             return "create"
         
     except Exception as e:
-        logger.error(f"Error preparing for next row after {row_index + 1}: {e}")
+        logger.error(f"Error preparing for next row after {excel_processor.source_row(row_index)}: {e}")
         return "error"
 
-def log_processing_summary(successful_rows, failed_rows, skipped_rows, last_success_info, last_failure_info):
+def log_processing_summary(successful_rows, failed_rows, skipped_rows, last_success_info, last_failure_info,
+                           unprocessed_rows=0, review_rows=None):
     """Log processing summary with last success/failure details"""
     logger.info(f"{'='*60}")
     logger_debug("="*60)
@@ -831,6 +1999,18 @@ def log_processing_summary(successful_rows, failed_rows, skipped_rows, last_succ
     logger_debug(f"Total failed rows: {len(failed_rows)}")
     logger.info(f"Total skipped rows (after retries): {len(skipped_rows)}")
     logger_debug(f"Total skipped rows (after retries): {len(skipped_rows)}")
+    if review_rows:
+        logger_debug(f"Saved rows needing review (read-back mismatch): {len(review_rows)}")
+        for row_info in review_rows:
+            logger_debug(f"  - Row {row_info['index']}: No. Docket {row_info['no_docket']} - {row_info['error']}")
+    if unprocessed_rows:
+        logger.info(f"Rows left for next run: {unprocessed_rows} ({ProcessingConfig.UNPROCESSED_PATH})")
+        logger_debug(f"Rows left for next run: {unprocessed_rows} ({ProcessingConfig.UNPROCESSED_PATH})")
+    for trip in circuit_breaker.trips:
+        outcome = f"recovered at {trip['recovered_at']}" if trip['recovered_at'] else "not recovered"
+        logger_debug(f"Circuit breaker tripped at {trip['opened_at']}: {trip['error_class']} in {trip['rate']:.0%} "
+                     f"of last {trip['attempts']} attempts ({trip['action']}, {trip['probes']} probes, {outcome}) "
+                     f"- last error: {trip['sample']}")
     logger.info(f"\n{'='*120}")
     logger_debug("="*120)
     
@@ -867,6 +2047,14 @@ def initialize_components(excel_file_path):
             return None, None
         
         excel_processor = ExcelDataProcessor(excel_file_path)
+        if ProcessingConfig.DELTA_PROCESSING:
+            row_ledger.load(ProcessingConfig.LEDGER_PATH)
+            excel_processor.reduce_to_delta(row_ledger)
+        if ProcessingConfig.SCHEDULE_BY_DEADLINE:
+            excel_processor.schedule_by_deadline(ProcessingConfig.PRIORITY_COLUMN)
+        if len(excel_processor.data) == 0:
+            logger.info("Excel file has no rows - nothing to process, browser not started")
+            return None, excel_processor
         driver = setup_driver()
         
         return driver, excel_processor
@@ -875,64 +2063,247 @@ def initialize_components(excel_file_path):
         return None, None
 
 
-def process_all_rows(driver, wait, excel_processor):
+def get_browser_memory_mb(driver):
+    """Return (megabytes, source) for the browser: Chrome process tree RSS via psutil, else JS heap"""
+    try:
+        import psutil
+        root = psutil.Process(driver.service.process.pid)
+        processes = [root] + root.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / 1048576, "rss"
+    except Exception:
+        pass
+    try:
+        used = driver.execute_script("return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : null;")
+        if used:
+            return used / 1048576, "js_heap"
+    except WebDriverException as e:
+        logger.warning(f"Could not read browser memory: {e}")
+    return None, None
+
+
+class BrowserWatchdog:
+    """Track browser memory and per-row latency, and restart Chrome cleanly at a row boundary"""
+
+    def __init__(self, driver, wait):
+        self.driver = driver
+        self.wait = wait
+        self.restarts = 0
+        self.respawn_times = []
+        self._reset()
+
+    def _reset(self):
+        self.rows_since_restart = 0
+        self.rows_since_memory_check = 0
+        self.latencies = []
+
+    def record_rows(self, elapsed, rows):
+        """Record the wall time spent on `rows` Excel rows (a create plus its duplicates)"""
+        rows = max(rows, 1)
+        self.latencies.extend([elapsed / rows] * rows)
+        self.rows_since_restart += rows
+        self.rows_since_memory_check += rows
+
+    def recycle_reason(self):
+        """Return why the browser should be recycled now, or None"""
+        config = ProcessingConfig
+        if config.RECYCLE_EVERY_ROWS and self.rows_since_restart >= config.RECYCLE_EVERY_ROWS:
+            return f"{self.rows_since_restart} rows since last restart"
+
+        window = config.LATENCY_WINDOW
+        if config.RECYCLE_LATENCY_FACTOR and window and len(self.latencies) >= 2 * window:
+            baseline = statistics.median(self.latencies[:window])
+            recent = statistics.median(self.latencies[-window:])
+            if baseline > 0 and recent > baseline * config.RECYCLE_LATENCY_FACTOR:
+                return f"row latency {recent:.1f}s vs baseline {baseline:.1f}s"
+
+        # record_rows menambah satu rantai duplicate sekaligus - hitung sejak sampel terakhir
+        if config.MEMORY_CHECK_EVERY and self.rows_since_memory_check >= config.MEMORY_CHECK_EVERY:
+            self.rows_since_memory_check = 0
+            memory_mb, source = get_browser_memory_mb(self.driver)
+            if memory_mb is not None:
+                logger.info(f"Browser memory ({source}): {memory_mb:.0f} MB")
+                limit = config.RECYCLE_MEMORY_MB if source == "rss" else config.RECYCLE_JS_HEAP_MB
+                if limit and memory_mb > limit:
+                    return f"browser {source} {memory_mb:.0f} MB > {limit} MB"
+        return None
+
+    def recycle(self, reason):
+        """Quit the driver and start a fresh, logged-in one"""
+        logger_debug(f"Recycling browser: {reason}")
+        try:
+            self.driver.quit()
+        except Exception as e:
+            # Driver yang crash bisa gagal quit dengan error koneksi
+            logger.warning(f"Error quitting old driver: {e}")
+        self.driver = None
+        try:
+            self.driver = setup_driver()
+            self.wait = WebDriverWait(self.driver, ProcessingConfig.WAIT_TIMEOUT)
+            login(self.driver, self.wait)
+        except Exception as e:
+            raise BrowserUnavailable(f"browser restart failed ({reason}): {e}") from e
+        self.restarts += 1
+        self._reset()
+
+    def respawn(self, reason):
+        """Rebuild a crashed session, refusing when respawns come too fast"""
+        now = time.monotonic()
+        self.respawn_times = [t for t in self.respawn_times if now - t < ProcessingConfig.RESPAWN_WINDOW]
+        if len(self.respawn_times) >= ProcessingConfig.RESPAWN_MAX:
+            raise BrowserUnavailable(f"Browser crashed {len(self.respawn_times)} times within "
+                               f"{ProcessingConfig.RESPAWN_WINDOW}s - giving up ({reason})")
+        backoff = ProcessingConfig.RESPAWN_BACKOFF * len(self.respawn_times)
+        if backoff:
+            logger.info(f"Waiting {backoff}s before respawning browser...")
+            time.sleep(backoff)
+        self.respawn_times.append(now)
+        self.recycle(f"session lost: {reason}")
+
+    def check(self):
+        """Recycle the browser if needed; returns True when the driver was replaced"""
+        reason = self.recycle_reason()
+        if reason:
+            self.recycle(reason)
+            return True
+        return False
+
+
+class RunWindow:
+    """Time window for a run: stop taking new chains once STOP_AT ("HH:MM") would be overrun"""
+
+    def __init__(self, stop_at=None):
+        self.started = time.time()
+        self.deadline = None
+        self.stop_at = stop_at
+        if stop_at:
+            hour, minute = (int(part) for part in stop_at.split(":"))
+            deadline = datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
+            if deadline <= datetime.now():
+                deadline += timedelta(days=1)  # Shift melewati tengah malam
+            self.deadline = deadline.timestamp()
+
+    def allows(self, chain_length, rows_done):
+        """True if a chain of chain_length rows should still finish before the deadline"""
+        if self.deadline is None:
+            return True
+        seconds_per_row = (time.time() - self.started) / rows_done if rows_done else 0
+        return time.time() + seconds_per_row * chain_length < self.deadline
+
+
+def rows_finished(results):
+    """Rows attempted so far (saved, failed or skipped) - rows deferred by the breaker do not count"""
+    return len(results['successful_rows']) + len(results['failed_rows']) + len(results['skipped_rows'])
+
+def process_all_rows(driver, wait, excel_processor, watchdog=None):
     """Process all rows from Excel with proper tracking"""
     results = {
         'successful_rows': [],
         'failed_rows': [],
         'skipped_rows': [],
+        'review_rows': [],
+        'unprocessed_rows': 0,
         'last_success_info': None,
         'last_failure_info': None
     }
     
     total_rows = len(excel_processor.data)
     logger.info(f"Starting to process {total_rows} rows from Excel")
-    
+    progress_tracker.start(results, total_rows)
+    run_window = RunWindow(ProcessingConfig.STOP_AT)
+    deferred = []  # Baris yang tidak dicoba (circuit breaker / jendela waktu)
+    excel_processor.start_prefetch()
     row_index = 0
-    while row_index < total_rows:
-        row_data = excel_processor.get_row_data(row_index)
-        
-        if row_data is None:
-            logger.warning(f"Skipping empty row {row_index + 1}")
-            row_index += 1
-            continue
+    try:
+        while row_index < total_rows:
+            # Batas baris (bukan di tengah rantai duplicate) - aman untuk restart browser
+            if watchdog and watchdog.check():
+                driver, wait = watchdog.driver, watchdog.wait
+            if not run_window.allows(excel_processor.chain_length(row_index), rows_finished(results)):
+                logger_debug(f"Time window ends at {run_window.stop_at} - stopping before row {excel_processor.source_row(row_index)}")
+                deferred.extend(range(row_index, total_rows))
+                break
+            gate = circuit_breaker.gate()
+            if gate == "pause":
+                time.sleep(min(circuit_breaker.pause_seconds(), 30))
+                continue
+            if gate == "skip":
+                chain_length = excel_processor.chain_length(row_index)
+                deferred.extend(range(row_index, row_index + chain_length))
+                row_index += chain_length
+                continue
+            if gate == "probe":
+                circuit_breaker.prepare_probe(driver, wait)
+            row_started = time.perf_counter()
+            first_row_index = row_index
+            command_profiler.current_row = excel_processor.source_row(row_index)
+            row_data = excel_processor.get_row_data(row_index)
         
-        # Process current row
-        no_docket = row_data.get('No. Docket', 'Unknown')
-        log_row_header(row_index + 1, total_rows, no_docket)
+            if row_data is None:
+                logger.warning(f"Skipping empty row {excel_processor.source_row(row_index)}")
+                row_index += 1
+                continue
         
-        success, processed_no_docket, error_message = process_excel_row_with_retry(
-            driver, wait, excel_processor, row_data, row_index
-        )
+            # Process current row
+            no_docket = row_data.get('No. Docket', 'Unknown')
+            log_row_header(row_index + 1, total_rows, excel_processor.source_row(row_index), no_docket)
         
-        if success:
-            # Handle successful row processing
-            row_index = handle_successful_row(
-                driver, wait, excel_processor, results, 
-                row_index, total_rows, processed_no_docket
-            )
-        else:
-            # Handle failed row processing
-            handle_failed_row(
-                driver, wait, results, row_index, 
-                processed_no_docket, error_message
-            )
+            try:
+                success, processed_no_docket, error_message = process_excel_row_with_retry(
+                    driver, wait, excel_processor, row_data, row_index
+                )
+            
+                if success:
+                    # Handle successful row processing
+                    row_index = handle_successful_row(
+                        driver, wait, excel_processor, results, 
+                        row_index, total_rows, processed_no_docket, error_message
+                    )
+                else:
+                    # Handle failed row processing
+                    handle_failed_row(
+                        driver, wait, results, excel_processor.source_row(row_index), 
+                        processed_no_docket, error_message, resume_index=row_index + 1
+                    )
+            except BrowserSessionLost as e:
+                # Lanjutkan dari baris yang terputus dengan browser baru (sebagai create)
+                circuit_breaker.session_lost()
+                row_index = e.row_index if e.row_index is not None else row_index
+                logger_debug(f"Browser session lost at row {excel_processor.source_row(row_index)}: {e}")
+                if watchdog is None:
+                    raise BrowserUnavailable("no watchdog to respawn the browser") from e
+                watchdog.respawn(str(e).splitlines()[0] if str(e) else "unknown")
+                driver, wait = watchdog.driver, watchdog.wait
+                continue
         
-        row_index += 1
-        time.sleep(2)  # Consider making this configurable
+            if watchdog:
+                watchdog.record_rows(time.perf_counter() - row_started, row_index - first_row_index + 1)
+            row_index += 1
+            time.sleep(ProcessingConfig.PROCESSING_DELAY)
+    except BrowserUnavailable as e:
+        # Hasil sejauh ini tetap dilaporkan; sisa baris untuk run berikutnya
+        logger_debug(f"Browser unavailable - stopping before row {excel_processor.source_row(row_index)}: {e}")
+        deferred.extend(range(row_index, total_rows))
+    finally:
+        excel_processor.stop_prefetch()
     
+    if deferred:
+        results['unprocessed_rows'] = excel_processor.write_unprocessed(deferred)
     return results
 
 
 def handle_successful_row(driver, wait, excel_processor, results, 
-                         row_index, total_rows, processed_no_docket):
+                         row_index, total_rows, processed_no_docket, review_note=""):
     """Handle successful row processing and potential duplicates"""
-    success_info = create_row_info(row_index + 1, processed_no_docket)
+    row_ledger.mark_saved(excel_processor.get_prepared_row(row_index))
+    row_number = excel_processor.source_row(row_index)
+    success_info = create_row_info(row_number, processed_no_docket)
     results['successful_rows'].append(success_info)
     results['last_success_info'] = success_info
+    if review_note:
+        note_needs_review(results, row_number, processed_no_docket, review_note)
     
-    logger.info(f"Row {row_index + 1} successfully saved - No. Docket: {processed_no_docket}")
-    logger_debug(f"Row {row_index + 1} successfully saved - No. Docket: {processed_no_docket}")
+    logger.info(f"Row {row_number} successfully saved - No. Docket: {processed_no_docket}")
+    logger_debug(f"Row {row_number} successfully saved - No. Docket: {processed_no_docket}")
     
     # Handle next row preparation and potential duplicates
     if row_index + 1 < total_rows:
@@ -957,7 +2328,7 @@ def handle_next_row_preparation(driver, wait, excel_processor, results,
             row_index, total_rows
         )
     elif next_action == "error":
-        logger.error(f"Error preparing for next row after {row_index + 1}")
+        logger.error(f"Error preparing for next row after {excel_processor.source_row(row_index)}")
     
     return row_index
 
@@ -972,18 +2343,20 @@ def process_duplicate_sequence(driver, wait, excel_processor, results,
         next_row_data = excel_processor.get_row_data(current_row)
         
         if next_row_data is None:
-            logger.warning(f"Next row {current_row + 1} is empty - skipping duplicate")
+            logger.warning(f"Next row {excel_processor.source_row(current_row)} is empty - skipping duplicate")
             break
         
         next_no_docket = next_row_data.get('No. Docket', 'Unknown')
-        log_duplicate_header(current_row + 1, total_rows, next_no_docket)
+        command_profiler.current_row = excel_processor.source_row(current_row)
+        log_duplicate_header(current_row + 1, total_rows, command_profiler.current_row, next_no_docket)
         
         duplicate_success, duplicate_no_docket, duplicate_error = process_duplicate_row_with_retry(
-            driver, wait, next_row_data, current_row
+            driver, wait, next_row_data, current_row,
+            values=excel_processor.get_prepared_row(current_row)
         )
         
         if duplicate_success:
-            handle_successful_duplicate(results, current_row, duplicate_no_docket)
+            handle_successful_duplicate(excel_processor, results, current_row, duplicate_no_docket, duplicate_error)
             
             # Check if there's another duplicate
             if current_row + 1 < total_rows:
@@ -993,51 +2366,534 @@ def process_duplicate_sequence(driver, wait, excel_processor, results,
             else:
                 break
         else:
-            handle_failed_duplicate(driver, wait, results, current_row, 
-                                  duplicate_no_docket, duplicate_error)
+            handle_failed_duplicate(driver, wait, results, excel_processor.source_row(current_row), 
+                                  duplicate_no_docket, duplicate_error, resume_index=current_row + 1)
             break
     
     return current_row
 
 
-def handle_successful_duplicate(results, row_index, no_docket):
+def handle_successful_duplicate(excel_processor, results, row_index, no_docket, review_note=""):
     """Handle successful duplicate processing"""
-    success_info = create_row_info(row_index + 1, no_docket)
+    row_ledger.mark_saved(excel_processor.get_prepared_row(row_index))
+    row_number = excel_processor.source_row(row_index)
+    success_info = create_row_info(row_number, no_docket)
     results['successful_rows'].append(success_info)
     results['last_success_info'] = success_info
+    if review_note:
+        note_needs_review(results, row_number, no_docket, review_note)
     
-    logger.info(f"Row {row_index + 1} successfully processed via duplicate - No. Docket: {no_docket}")
-    logger_debug(f"Row {row_index + 1} successfully processed via duplicate - No. Docket: {no_docket}")
+    logger.info(f"Row {row_number} successfully processed via duplicate - No. Docket: {no_docket}")
+    logger_debug(f"Row {row_number} successfully processed via duplicate - No. Docket: {no_docket}")
 
 
-def handle_failed_duplicate(driver, wait, results, row_index, no_docket, error_message):
-    """Handle failed duplicate processing"""
+def handle_failed_duplicate(driver, wait, results, row_number, no_docket, error_message, resume_index=None):
+    """Handle failed duplicate processing (row_number: 1-based workbook row).
+
+    resume_index is the row to continue from if the browser dies during the refresh.
+    """
     if is_max_retry_error(error_message):
-        skipped_info = create_error_info(row_index + 1, no_docket, error_message)
+        skipped_info = create_error_info(row_number, no_docket, error_message)
         results['skipped_rows'].append(skipped_info)
-        logger.warning(f"Row {row_index + 1} skipped after max retries - No. Docket: {no_docket}")
+        logger.warning(f"Row {row_number} skipped after max retries - No. Docket: {no_docket}")
     else:
-        failure_info = create_error_info(row_index + 1, no_docket, error_message)
+        failure_info = create_error_info(row_number, no_docket, error_message)
         results['failed_rows'].append(failure_info)
         results['last_failure_info'] = failure_info
     
-    log_failed_duplicate(row_index + 1, no_docket, error_message)
-    refresh_and_wait(driver, wait)
+    log_failed_duplicate(row_number, no_docket, error_message)
+    forensics.capture(driver, row_number, no_docket, error_message)
+    with session_guard(driver, resume_index):
+        refresh_and_wait(driver, wait)
+
 
+def handle_failed_row(driver, wait, results, row_number, no_docket, error_message, resume_index=None):
+    """Handle failed row processing (row_number: 1-based workbook row).
 
-def handle_failed_row(driver, wait, results, row_index, no_docket, error_message):
-    """Handle failed row processing"""
+    resume_index is the row to continue from if the browser dies during the refresh.
+    """
     if is_max_retry_error(error_message):
-        skipped_info = create_error_info(row_index + 1, no_docket, error_message)
+        skipped_info = create_error_info(row_number, no_docket, error_message)
         results['skipped_rows'].append(skipped_info)
-        logger.warning(f"Row {row_index + 1} skipped after max retries - No. Docket: {no_docket}")
+        logger.warning(f"Row {row_number} skipped after max retries - No. Docket: {no_docket}")
     else:
-        failure_info = create_error_info(row_index + 1, no_docket, error_message)
+        failure_info = create_error_info(row_number, no_docket, error_message)
         results['failed_rows'].append(failure_info)
         results['last_failure_info'] = failure_info
     
-    log_failed_row(row_index + 1, no_docket, error_message)
-    refresh_and_wait(driver, wait)
+    log_failed_row(row_number, no_docket, error_message)
+    forensics.capture(driver, row_number, no_docket, error_message)
+    with session_guard(driver, resume_index):
+        refresh_and_wait(driver, wait)
+
+
+ACTIVE_DOM_SCRIPT = """
+    var modals = Array.prototype.filter.call(document.querySelectorAll('.modal'),
+        function (m) { return m.getClientRects().length; });
+    var node = modals[modals.length - 1] || document.querySelector('.o_form_view') || document.body;
+    return node.outerHTML;
+"""
+
+class ForensicsWriter:
+    """Capture screenshot, active form/modal DOM and console log of a failed row.
+
+    Capturing is a few WebDriver calls on the browser thread; the files are
+    written by a background thread into a per-run directory under FORENSICS_DIR.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.thread = None
+        self.run_dir = None
+        self.bytes_written = 0
+        self.budget_exhausted = False
+
+    def start(self):
+        base_dir = ProcessingConfig.FORENSICS_DIR
+        os.makedirs(base_dir, exist_ok=True)
+        # Retensi: hanya simpan FORENSICS_KEEP_RUNS run terakhir (termasuk run ini)
+        runs = sorted(d for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d)))
+        for old_run in runs[:max(len(runs) - ProcessingConfig.FORENSICS_KEEP_RUNS + 1, 0)]:
+            shutil.rmtree(os.path.join(base_dir, old_run), ignore_errors=True)
+        self.run_dir = os.path.join(base_dir, datetime.now().strftime("run_%Y%m%d_%H%M%S"))
+        os.makedirs(self.run_dir, exist_ok=True)
+        self.thread = threading.Thread(target=self._write_loop, name="forensics-writer", daemon=True)
+        self.thread.start()
+
+    def capture(self, driver, row_num, no_docket, error_message):
+        """Grab the failure state and queue it for writing; never raises"""
+        if not ProcessingConfig.FORENSICS_ENABLED or self.budget_exhausted:
+            return
+        try:
+            if self.thread is None:
+                self.start()
+            artifacts = {"error.txt": f"Row {row_num} - No. Docket: {no_docket}\n{error_message}\n".encode("utf-8")}
+            artifacts["screenshot.png"] = driver.get_screenshot_as_png()
+            artifacts["dom.html"] = (driver.execute_script(ACTIVE_DOM_SCRIPT) or "").encode("utf-8")
+            try:
+                console = driver.get_log("browser")
+            except WebDriverException:
+                console = []
+            artifacts["console.log"] = "\n".join(f"{entry.get('level')} {entry.get('message')}" for entry in console).encode("utf-8")
+            name = f"row_{row_num:05d}_{datetime.now().strftime('%H%M%S')}"
+            self.queue.put((name, artifacts))
+        except Exception as e:
+            logger.warning(f"Failure capture for row {row_num} failed: {e}")
+
+    def _write_loop(self):
+        while True:
+            name, artifacts = self.queue.get()
+            try:
+                size = sum(len(data) for data in artifacts.values())
+                if self.bytes_written + size > ProcessingConfig.FORENSICS_MAX_MB * 1048576:
+                    self.budget_exhausted = True
+                    logger.warning(f"Forensics size budget ({ProcessingConfig.FORENSICS_MAX_MB} MB) reached - capture disabled")
+                    continue
+                capture_dir = os.path.join(self.run_dir, name)
+                os.makedirs(capture_dir, exist_ok=True)
+                for filename, data in artifacts.items():
+                    with open(os.path.join(capture_dir, filename), "wb") as f:
+                        f.write(data)
+                self.bytes_written += size
+                logger.info(f"Failure artifacts written to {capture_dir}")
+            except Exception as e:
+                logger.warning(f"Could not write failure artifacts {name}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wait for queued captures to reach disk"""
+        if self.thread is not None:
+            self.queue.join()
+
+
+# Writer global agar semua handler kegagalan memakai run directory yang sama
+forensics = ForensicsWriter()
+
+
+class TabWorker:
+    """One browser tab with its own form in progress, working through duplicate chains"""
+
+    def __init__(self, name, handle):
+        self.name = name
+        self.handle = handle
+        self.current_row = None
+        self.rows_done = 0
+        self.rows_failed = 0
+        self.remaining = []
+        self.task = None
+        self.started = False
+        self.ready_at = 0.0
+
+    def process_row(self, driver, wait, excel_processor, row_index, duplicate, max_retries=3):
+        """Generator: enter and save one row, yielding whenever the tab waits on the server.
+
+        Yields the seconds the tab has to wait (None = just give way); the
+        scheduler sends back True when other tabs ran in between. Returns
+        (success, error_message) through StopIteration.
+        """
+        row_data = excel_processor.get_row_data(row_index)
+        values = excel_processor.get_prepared_row(row_index)
+        self.current_row = row_index
+        last_error = ""
+        for attempt in range(max_retries):
+            try:
+                if duplicate and attempt == 0:
+                    yield from duplicate_steps(driver, wait, row_data, values)
+                else:
+                    if attempt > 0:
+                        refresh_and_wait(driver, wait)
+                    open_new_form(driver, wait, warm=(attempt == 0))
+                    yield
+                    yield from fill_proyek_steps(driver, wait, row_data, values)
+                    yield from fill_docket_steps(driver, wait, row_data, values)
+                    yield from add_table_rows_steps(driver, wait, row_data, values)
+                click_save(driver, wait)
+                # Server menyimpan - tab lain bekerja dulu
+                yield
+                if ProcessingConfig.CONFIRM_SAVE:
+                    confirm_save(driver, values)
+                else:
+                    wait_for_loading_overlay_to_disappear(driver, wait)
+                circuit_breaker.record_success()
+                return True, ""
+            except SaveValidationError as e:
+                if e.record_id is not None:
+                    circuit_breaker.record_success()
+                    return True, saved_needs_review_note(e)
+                circuit_breaker.record_failure(driver, e)
+                return False, f"Odoo validation error: {e.message}"
+            except Exception as e:
+                if is_session_dead(driver, e):
+                    raise BrowserSessionLost(str(e), row_index) from e
+                circuit_breaker.record_failure(driver, e)
+                if circuit_breaker.is_open():
+                    return False, circuit_breaker.reason()
+                last_error = str(e)
+                logger.warning(f"[{self.name}] Attempt {attempt + 1}/{max_retries} failed for row {excel_processor.source_row(row_index)}: {e}")
+                if attempt < max_retries - 1:
+                    progress_tracker.record_retry()
+                yield
+        return False, f"{last_error or 'Unknown error'} - failed after {max_retries} attempts"
+
+    def run(self, driver, wait, excel_processor, chains, results, run_window=None, deferred=None):
+        """Generator: take chains from the shared queue until it is empty or the time window closes"""
+        deferred = [] if deferred is None else deferred
+        while chains:
+            if run_window and not run_window.allows(len(chains[0]), rows_finished(results)):
+                logger_debug(f"[{self.name}] Time window ends at {run_window.stop_at} - not starting new chains")
+                return
+            gate = circuit_breaker.gate()
+            if gate == "pause":
+                yield min(circuit_breaker.pause_seconds(), 1)
+                continue
+            if gate == "skip":
+                deferred.extend(chains.popleft())
+                continue
+            if gate == "probe":
+                circuit_breaker.prepare_probe(driver, wait)
+            chain = chains.popleft()
+            chain_ok = False
+            for position, row_index in enumerate(chain):
+                self.remaining = chain[position:]
+                row_data = excel_processor.get_row_data(row_index)
+                row_number = excel_processor.source_row(row_index)
+                no_docket = row_data.get('No. Docket', 'Unknown')
+                logger.info(f"[{self.name}] Processing Row {row_number} - No. Docket: {no_docket}")
+                # Duplicate hanya jika baris sebelumnya di tab ini tersimpan
+                duplicate = position > 0 and chain_ok
+                success, error_message = yield from self.process_row(driver, wait, excel_processor, row_index, duplicate)
+                if success:
+                    self.rows_done += 1
+                    row_ledger.mark_saved(excel_processor.get_prepared_row(row_index))
+                    success_info = create_row_info(row_number, no_docket)
+                    results['successful_rows'].append(success_info)
+                    results['last_success_info'] = success_info
+                    if error_message:
+                        note_needs_review(results, row_number, no_docket, error_message)
+                    logger_debug(f"[{self.name}] Row {row_number} successfully saved - No. Docket: {no_docket}")
+                else:
+                    self.rows_failed += 1
+                    # Baris ini sudah tercatat gagal - jangan ditunda bila browser mati saat refresh
+                    self.remaining = chain[position + 1:]
+                    handle_failed_row(driver, wait, results, row_number, no_docket, error_message)
+                chain_ok = success
+                logger_debug(progress_tracker.progress_line())
+            self.remaining = []
+
+
+def process_all_rows_multitab(driver, wait, excel_processor, tab_count):
+    """Process all rows with several tabs in one browser, interleaving their server waits"""
+    results = {
+        'successful_rows': [],
+        'failed_rows': [],
+        'skipped_rows': [],
+        'review_rows': [],
+        'unprocessed_rows': 0,
+        'last_success_info': None,
+        'last_failure_info': None
+    }
+    chains = deque(excel_processor.build_chains())
+    run_window = RunWindow(ProcessingConfig.STOP_AT)
+    deferred = []  # Baris yang dilewati circuit breaker
+    progress_tracker.start(results, len(excel_processor.data))
+    logger.info(f"Starting to process {len(excel_processor.data)} rows ({len(chains)} chains) in {tab_count} tabs")
+
+    tabs = [TabWorker("tab 1", driver.current_window_handle)]
+    for number in range(2, tab_count + 1):
+        driver.switch_to.new_window("tab")
+        tabs.append(TabWorker(f"tab {number}", driver.current_window_handle))
+    for tab in tabs:
+        tab.task = tab.run(driver, wait, excel_processor, chains, results, run_window, deferred)
+
+    excel_processor.start_prefetch()
+    try:
+        active = list(tabs)
+        previous = None
+        while active:
+            # Tab yang masih menunggu (delay dari yield) dilewati; tidur hanya bila semua menunggu
+            now = time.monotonic()
+            ready = [tab for tab in active if tab.ready_at <= now]
+            if not ready:
+                time.sleep(min(tab.ready_at for tab in active) - now)
+                continue
+            for tab in ready:
+                try:
+                    if previous is not tab:
+                        driver.switch_to.window(tab.handle)
+                    command_profiler.current_row = excel_processor.source_row(tab.current_row) if tab.current_row is not None else None
+                    # True = tab lain sempat bekerja sejak yield terakhir tab ini
+                    delay = tab.task.send(previous is not tab) if tab.started else next(tab.task)
+                    tab.started = True
+                    previous = tab
+                    tab.ready_at = time.monotonic() + (delay or 0)
+                except StopIteration:
+                    active.remove(tab)
+                except Exception as e:
+                    if not isinstance(e, BrowserSessionLost) and not is_session_dead(driver, e):
+                        raise
+                    # Semua tab memakai satu browser - hentikan semuanya, sisa baris untuk run berikutnya
+                    circuit_breaker.session_lost()
+                    logger_debug(f"Browser session lost in {tab.name} - stopping all tabs: "
+                                 f"{str(e).splitlines()[0] if str(e) else 'unknown'}")
+                    for worker in tabs:
+                        deferred.extend(worker.remaining)
+                    active = []
+                    break
+    finally:
+        excel_processor.stop_prefetch()
+
+    deferred.extend(row_index for chain in chains for row_index in chain)
+    if deferred:
+        results['unprocessed_rows'] = excel_processor.write_unprocessed(sorted(deferred))
+    for tab in tabs:
+        logger_debug(f"{tab.name}: {tab.rows_done} rows saved, {tab.rows_failed} failed")
+    return results
+
+
+def export_import_batches(excel_processor, output_dir, batch_size=None):
+    """Write the workbook as Odoo import CSV files, one record plus its 4 sample lines per row.
+
+    Parent columns are only filled on a record's first line, as Odoo's
+    import expects for one2many lines. Returns the written file paths.
+    """
+    import csv
+    batch_size = batch_size or ProcessingConfig.IMPORT_BATCH_SIZE
+    parent_columns = ProcessingConfig.IMPORT_COLUMNS
+    line_columns = ProcessingConfig.IMPORT_LINE_COLUMNS
+    line_field = ProcessingConfig.IMPORT_LINE_FIELD
+    header = list(parent_columns.values()) + [f"{line_field}/{column}" for column in line_columns.values()]
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    total_rows = len(excel_processor.data)
+    model_slug = ProcessingConfig.IMPORT_MODEL.replace(".", "_")
+    for batch_number, batch_start in enumerate(range(0, total_rows, batch_size), start=1):
+        path = os.path.join(output_dir, f"{model_slug}_{batch_number:03d}.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for row_index in range(batch_start, min(batch_start + batch_size, total_rows)):
+                values = excel_processor.prepare_row(row_index)
+                if values is None:
+                    continue
+                for no_urut in range(1, 5):
+                    line = derive_line_values(values, no_urut)
+                    parent = [values[key] if no_urut == 1 else "" for key in parent_columns]
+                    writer.writerow(parent + [line[key] for key in line_columns])
+        paths.append(path)
+        logger_debug(f"Import batch {batch_number}: {path} (rows {batch_start + 1}-{min(batch_start + batch_size, total_rows)})")
+    return paths
+
+def run_bulk_import(driver, wait, path):
+    """Upload one import file through Odoo's import screen; returns (success, message)"""
+    list_url = f"https://rmc.adhimix.web.id/web?#min=1&limit=80&view_type=list&model={ProcessingConfig.IMPORT_MODEL}&menu_id=535"
+    logger.info(f"Importing {path}...")
+    driver.get(list_url)
+    wait_for_loading_overlay_to_disappear(driver, wait)
+    import_button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "button.o_button_import, .oe_list_button_import")))
+    import_button.click()
+    file_input = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input.oe_import_file")))
+    file_input.send_keys(os.path.abspath(path))
+    wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, ".oe_import_grid")))
+
+    for button_class in ("o_import_validate", "o_import_import"):
+        button = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, f"button.{button_class}, .oe_{button_class[2:]}")))
+        button.click()
+        wait_for_loading_overlay_to_disappear(driver, wait)
+        errors = [e.text for e in driver.find_elements(By.CSS_SELECTOR, ".oe_import_report_error, .oe_import_report .alert-danger") if e.text]
+        if errors:
+            return False, "; ".join(errors)
+    return True, ""
+
+def bulk_import_all(driver, wait, paths):
+    """Drive the import screen once per batch file"""
+    results = {'imported': [], 'failed': []}
+    for path in paths:
+        try:
+            success, message = run_bulk_import(driver, wait, path)
+        except Exception as e:
+            success, message = False, str(e)
+        if success:
+            results['imported'].append(path)
+            logger_debug(f"Imported {path}")
+        else:
+            results['failed'].append((path, message))
+            logger_debug(f"Import failed for {path}: {message}")
+    return results
+
+class ProgressTracker:
+    """Rows done/failed/skipped, rate, ETA, current step and retries, taken from `results`"""
+
+    def __init__(self):
+        self.results = None
+        self.total_rows = 0
+        self.retries = 0
+        self.started = None
+        self.finished_times = deque()
+        self.finished_count = 0
+        self.thread_id = None
+        # tick()/status() dipanggil dari thread browser dan thread handler HTTP
+        self.lock = threading.Lock()
+
+    def start(self, results, total_rows):
+        with self.lock:
+            self.results = results
+            self.total_rows = total_rows
+            self.started = time.time()
+            self.finished_times.clear()
+            self.finished_count = 0
+            self.thread_id = threading.get_ident()
+
+    def record_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def tick(self):
+        """Record completion times of rows finished since the last tick"""
+        with self.lock:
+            self._tick()
+
+    def _tick(self):
+        if self.results is None:
+            return
+        finished = sum(len(self.results[key]) for key in ('successful_rows', 'failed_rows', 'skipped_rows'))
+        now = time.time()
+        self.finished_times.extend([now] * (finished - self.finished_count))
+        self.finished_count = finished
+        while self.finished_times and now - self.finished_times[0] > ProcessingConfig.PROGRESS_WINDOW:
+            self.finished_times.popleft()
+
+    def current_step(self):
+        """Innermost pipeline step the browser thread is in (read from its stack)"""
+        frame = sys._current_frames().get(self.thread_id)
+        while frame is not None:
+            if frame.f_globals is globals() and CommandProfiler.step_name(frame.f_code.co_name):
+                return CommandProfiler.step_name(frame.f_code.co_name)
+            frame = frame.f_back
+        return None
+
+    def status(self):
+        with self.lock:
+            self._tick()
+            results = self.results or {'successful_rows': [], 'failed_rows': [], 'skipped_rows': []}
+            elapsed = time.time() - self.started if self.started else 0
+            # Minimal 30 detik agar rate di awal run tidak melonjak
+            window = max(min(ProcessingConfig.PROGRESS_WINDOW, elapsed), 30)
+            rows_per_minute = len(self.finished_times) * 60 / window
+            remaining = max(self.total_rows - self.finished_count, 0)
+            status = {
+                'total_rows': self.total_rows,
+                'successful': len(results['successful_rows']),
+                'failed': len(results['failed_rows']),
+                'skipped': len(results['skipped_rows']),
+                'remaining': remaining,
+                'rows_per_minute': round(rows_per_minute, 2),
+                'eta_seconds': round(remaining * 60 / rows_per_minute) if rows_per_minute else None,
+                'elapsed_seconds': round(elapsed),
+                'retries': self.retries,
+            }
+        status['current_step'] = self.current_step()
+        return status
+
+    def progress_line(self):
+        status = self.status()
+        eta = str(timedelta(seconds=status['eta_seconds'])) if status['eta_seconds'] is not None else "-"
+        done = status['total_rows'] - status['remaining']
+        return (f"PROGRESS {done}/{status['total_rows']} - ok {status['successful']}, failed {status['failed']}, "
+                f"skipped {status['skipped']} - {status['rows_per_minute']:.1f} rows/min - ETA {eta} - retries {status['retries']}")
+
+    def prometheus(self):
+        status = self.status()
+        lines = [
+            "# TYPE odoo_automation_rows gauge",
+            f'odoo_automation_rows{{status="successful"}} {status["successful"]}',
+            f'odoo_automation_rows{{status="failed"}} {status["failed"]}',
+            f'odoo_automation_rows{{status="skipped"}} {status["skipped"]}',
+            f'odoo_automation_rows{{status="remaining"}} {status["remaining"]}',
+            "# TYPE odoo_automation_rows_per_minute gauge",
+            f"odoo_automation_rows_per_minute {status['rows_per_minute']}",
+            "# TYPE odoo_automation_eta_seconds gauge",
+            f"odoo_automation_eta_seconds {status['eta_seconds'] if status['eta_seconds'] is not None else 'NaN'}",
+            "# TYPE odoo_automation_retries_total counter",
+            f"odoo_automation_retries_total {status['retries']}",
+        ]
+        if status['current_step']:
+            lines += ["# TYPE odoo_automation_current_step gauge",
+                      f'odoo_automation_current_step{{step="{status["current_step"]}"}} 1']
+        return "\n".join(lines) + "\n"
+
+
+# Tracker global agar handler HTTP dan loop baris berbagi status yang sama
+progress_tracker = ProgressTracker()
+
+def start_status_server(port):
+    """Serve /status (JSON) and /metrics (Prometheus text) on localhost in a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StatusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/metrics"):
+                body, content_type = progress_tracker.prometheus(), "text/plain; version=0.0.4"
+            elif self.path.startswith("/status") or self.path == "/":
+                body, content_type = json.dumps(progress_tracker.status()), "application/json"
+            else:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StatusHandler)
+    threading.Thread(target=server.serve_forever, name="status-server", daemon=True).start()
+    logger.info(f"Status endpoint on http://127.0.0.1:{port}/status and /metrics")
+    return server
 
 
 def cleanup_resources(driver):
@@ -1064,19 +2920,21 @@ def is_max_retry_error(error_message):
     return "after" in error_message and "attempts" in error_message
 
 
-def log_row_header(row_num, total_rows, no_docket):
-    """Log row processing header"""
+def log_row_header(position, total_rows, row_num, no_docket):
+    """Log row processing header (position in this run, row_num in the workbook)"""
     logger.info(f"{'='*100}")
-    logger.info(f"Processing Row {row_num}/{total_rows} - No. Docket: {no_docket}")
+    logger.info(f"Processing {position}/{total_rows} - Row {row_num} - No. Docket: {no_docket}")
     logger.info(f"{'='*100}")
     logger_debug(f"{'='*100}")
+    logger_debug(progress_tracker.progress_line())
 
 
-def log_duplicate_header(row_num, total_rows, no_docket):
-    """Log duplicate row processing header"""
+def log_duplicate_header(position, total_rows, row_num, no_docket):
+    """Log duplicate row processing header (position in this run, row_num in the workbook)"""
     logger.info(f"\n{'='*50}")
-    logger.info(f"Processing Row {row_num}/{total_rows} (via duplicate) - No. Docket: {no_docket}")
+    logger.info(f"Processing {position}/{total_rows} - Row {row_num} (via duplicate) - No. Docket: {no_docket}")
     logger.info(f"{'='*50}")
+    logger_debug(progress_tracker.progress_line())
 
 
 def log_failed_row(row_num, no_docket, error_message):
@@ -1097,27 +2955,490 @@ def log_failed_duplicate(row_num, no_docket, error_message):
 class ProcessingConfig:
     """Configuration class for processing parameters"""
     EXCEL_FILE_PATH = "data.xlsx"
-    WAIT_TIMEOUT = 10
-    PROCESSING_DELAY = 2
+    TIMING_PROFILES_PATH = "timing_profiles.json"
     ERROR_MESSAGE_DUPLICATE = "Tidak ada No. Docket / Sudah Pernah diinput"
 
-def main():
+    # Timing profile aktif - nilai di bawah adalah profile "default" dan
+    # ditimpa oleh load_timing_profile
+    TIMING_PROFILE = "default"
+    WAIT_TIMEOUT = 10          # WebDriverWait utama
+    FIELD_WAIT_TIMEOUT = 5     # WebDriverWait per baris tabel / modal
+    OVERLAY_MAX_WAIT = 20      # Batas total menunggu blockUI
+    PROCESSING_DELAY = 2       # Jeda antar baris Excel
+    STEP_DELAY = 1             # Jeda antar langkah pengisian form
+    AUTOCOMPLETE_DELAY = 3     # Jeda setelah mengetik field autocomplete
+    PAGE_LOAD_DELAY = 3        # Jeda setelah login / refresh
+    DUPLICATE_DELAY = 2        # Jeda setelah klik Duplicate
+    SAVE_DELAY = 3             # Jeda setelah klik Save
+
+    PREFETCH_LOOKAHEAD = 5         # Baris yang disiapkan di background thread (0 = inline)
+    FAST_INPUT = True              # Isi field teks/angka lewat satu script call
+    COMMAND_PROFILE_TOP_N = 15     # Jumlah call site di laporan --profile-commands
+    CONFIRM_SAVE = True            # Tunggu form tersimpan (readonly + id) alih-alih SAVE_DELAY
+    SAVE_READBACK = True           # Cocokkan docket dan jumlah baris sampel setelah Save
+    DIFF_DUPLICATE = True          # Duplicate: tulis hanya field/baris yang berbeda
+    CACHED_OPTIONS = True          # Pilih opsi umur/bentuk/tempat lewat cache per sesi
+    WARM_FORM = True               # Pakai Create in-app, bukan reload list view per baris
+    # DIFF_DUPLICATE: kolom td[data-field] list baris sampel per nilai derive_line_values;
+    # bila salah satu kolom tidak tampil, semua baris sampel diisi ulang
+    DUPLICATE_LINE_COLUMNS = {
+        'nomor_urut': "nomor_urut",
+        'kode_benda_uji': "kode_benda_uji",
+        'rencana_umur_test': "rencana_umur_test",
+        'bentuk_benda_uji': "bentuk_benda_uji",
+        'tempat_pengetesan': "tempat_pengetesan",
+    }
+
+    # Browser recycling (BrowserWatchdog) - 0 mematikan pemeriksaan terkait
+    RECYCLE_EVERY_ROWS = 300       # Restart Chrome setiap N baris
+    RECYCLE_MEMORY_MB = 2048       # Batas RSS proses Chrome (psutil) ...
+    RECYCLE_JS_HEAP_MB = 512       # ... atau JS heap halaman jika psutil tidak ada
+    RECYCLE_LATENCY_FACTOR = 1.5   # Median latency terbaru vs baseline setelah restart
+    LATENCY_WINDOW = 20            # Jumlah baris untuk baseline / median terbaru
+    MEMORY_CHECK_EVERY = 10        # Periksa memory setiap N baris
+
+    # Bulk import (--export-import / --bulk-import). Hanya nomor_urut dan
+    # bentuk_benda_uji yang terlihat di form; nama field lain sesuaikan dengan model.
+    IMPORT_MODEL = "schedule.truck.mixer.benda.uji"
+    IMPORT_BATCH_SIZE = 200
+    IMPORT_DIR = "import_batches"
+    IMPORT_COLUMNS = {
+        'tgl_mulai_prod': "tgl_mulai_prod",
+        'proyek': "proyek_id",
+        'no_docket': "no_docket_id",
+        'slump_rencana': "slump_rencana",
+        'slump_test': "slump_test",
+        'yield_value': "yield",
+        'nama_teknisi': "nama_teknisi",
+        'jam_sample': "jam_sample",
+    }
+    IMPORT_LINE_FIELD = "benda_uji_ids"
+    IMPORT_LINE_COLUMNS = {
+        'nomor_urut': "nomor_urut",
+        'kode_benda_uji': "kode_benda_uji",
+        'rencana_umur_test': "rencana_umur_test",
+        'bentuk_benda_uji': "bentuk_benda_uji",
+        'tempat_pengetesan': "tempat_pengetesan",
+    }
+    TEMPAT_PENGETESAN = "Internal"   # Pilihan ke-2 pada select Tempat Pengetesan
+    RESPAWN_MAX = 5                # Maks. respawn Chrome setelah crash dalam RESPAWN_WINDOW
+    RESPAWN_WINDOW = 600           # Detik
+    RESPAWN_BACKOFF = 5            # Detik tambahan per respawn dalam window
+    PROGRESS_WINDOW = 600          # Detik - sliding window untuk rows/min dan ETA
+    DOCKET_NEAR_MISS_RATIO = 0.8   # Kemiripan minimal untuk dicatat sebagai near miss
+    FORENSICS_ENABLED = True       # Simpan screenshot/DOM/console log baris yang gagal
+    FORENSICS_DIR = "artifacts"
+    FORENSICS_MAX_MB = 200         # Batas ukuran artefak per run
+    FORENSICS_KEEP_RUNS = 10       # Jumlah run directory yang disimpan
+    SCHEDULE_BY_DEADLINE = False   # Urutkan rantai per tgl_mulai_prod (kolom 0), lalu PRIORITY_COLUMN
+    PRIORITY_COLUMN = None         # Nama kolom prioritas (angka kecil = lebih mendesak)
+    STOP_AT = None                 # "HH:MM" - akhir jendela waktu run
+    UNPROCESSED_PATH = "unprocessed_rows.xlsx"
+    DELTA_PROCESSING = False       # Proses hanya baris baru/berubah (lihat RowLedger)
+    LEDGER_PATH = "row_fingerprints.json"
+    LEDGER_SAVE_EVERY = 25         # Simpan ledger setiap N baris tersimpan
+    NEEDS_UPDATE_PATH = "rows_needing_update.xlsx"
+    FINGERPRINT_COLUMNS = (0, 1, 2, 3, 4, 6, 8)  # Kolom bisnis yang dipakai derive_row_values
+    REPLAY_TOLERANCE = 0.05        # Toleransi regresi --replay terhadap baseline
+    BREAKER_WINDOW = 20            # Jumlah percobaan terakhir untuk failure rate per kelas error
+    BREAKER_MIN_ATTEMPTS = 10      # Minimal percobaan di window sebelum breaker bisa terbuka
+    BREAKER_THRESHOLD = 0.6        # Porsi kegagalan satu kelas yang membuka breaker
+    BREAKER_ACTION = "pause"       # "pause" (tunggu probe) atau "skip" (tunda baris ke UNPROCESSED_PATH)
+    BREAKER_PROBE_INTERVAL = 60    # Detik sampai probe pertama; digandakan tiap probe gagal
+    BREAKER_PROBE_MAX = 900        # Detik - interval probe maksimum
+    BREAKER_POLL_INTERVAL = 1      # Detik - jeda cek ulang selama pause / probe berjalan
+    TIMING_KEYS = ("WAIT_TIMEOUT", "FIELD_WAIT_TIMEOUT", "OVERLAY_MAX_WAIT", "PROCESSING_DELAY",
+                   "STEP_DELAY", "AUTOCOMPLETE_DELAY", "PAGE_LOAD_DELAY", "SAVE_DELAY", "DUPLICATE_DELAY")
+
+    @classmethod
+    def timing(cls):
+        """Return the active timing values as a profile dict"""
+        return {key.lower(): getattr(cls, key) for key in cls.TIMING_KEYS}
+
+    @classmethod
+    def load_timing_profile(cls, name=None, path=None):
+        """Apply a named timing profile from the JSON profile file.
+
+        The file looks like {"active": "lan", "profiles": {"lan": {"wait_timeout": 5, ...}}}.
+        Keys missing from a profile keep their default value.
+        """
+        path = path or cls.TIMING_PROFILES_PATH
+        if not os.path.exists(path):
+            if name not in (None, "default"):
+                raise ValueError(f"Timing profile '{name}' requested but {path} does not exist")
+            logger.info(f"No timing profile file ({path}); using built-in defaults")
+            return cls.timing()
+
+        with open(path, encoding="utf-8") as f:
+            content = json.load(f)
+        profiles = content.get("profiles", {})
+        name = name or content.get("active", "default")
+        if name not in profiles:
+            if name == "default":
+                return cls.timing()
+            raise ValueError(f"Timing profile '{name}' not found in {path} (available: {', '.join(profiles)})")
+
+        for key, value in profiles[name].items():
+            attr = key.upper()
+            if attr not in cls.TIMING_KEYS:
+                logger.warning(f"Ignoring unknown timing key '{key}' in profile '{name}'")
+                continue
+            setattr(cls, attr, value)
+        cls.TIMING_PROFILE = name
+        logger.info(f"Timing profile '{name}' loaded from {path}: {cls.timing()}")
+        return cls.timing()
+
+    @classmethod
+    def save_timing_profile(cls, name, values, path=None, activate=True):
+        """Write (or overwrite) one named profile in the JSON profile file"""
+        path = path or cls.TIMING_PROFILES_PATH
+        content = {"active": "default", "profiles": {}}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                content = json.load(f)
+        content.setdefault("profiles", {})[name] = values
+        if activate:
+            content["active"] = name
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(content, f, indent=2)
+        logger.info(f"Timing profile '{name}' written to {path}")
+
+def _clamp(value, lower, upper):
+    return max(lower, min(upper, value))
+
+def probe_page_load(driver, wait):
+    """Time a full list-view load until the Create button is clickable"""
+    started = time.perf_counter()
+    navigate_and_create(driver, wait)
+    return time.perf_counter() - started
+
+def probe_autocomplete(driver, wait, text):
+    """Time the proyek autocomplete dropdown appearing after typing"""
+    proyek_field = wait.until(EC.element_to_be_clickable((By.XPATH, PROYEK_FIELD_XPATH)))
+    proyek_field.clear()
+    started = time.perf_counter()
+    proyek_field.send_keys(text)
+    wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "ul.ui-autocomplete li")))
+    elapsed = time.perf_counter() - started
+    proyek_field.send_keys(Keys.ESCAPE)
+    proyek_field.clear()
+    return elapsed
+
+def calibrate_timing(driver, wait, sample_text="a", probes=3):
+    """Run probe operations against the server and derive the tightest safe timing profile.
+
+    Nothing is saved in Odoo: the probes only load the list view, open a new
+    form and trigger the proyek autocomplete. Save-related delays
+    (processing_delay, save_delay, duplicate_delay) are not probed and keep
+    their defaults.
+    """
+    page_times, autocomplete_times = [], []
+    for probe in range(probes):
+        logger.info(f"Calibration probe {probe + 1}/{probes}...")
+        page_times.append(probe_page_load(driver, wait))
+        wait_for_loading_overlay_to_disappear(driver, wait)
+        autocomplete_times.append(probe_autocomplete(driver, wait, sample_text))
+
+    # Pakai sampel terlambat dengan faktor keamanan, dibatasi agar tetap wajar
+    page, autocomplete = max(page_times), max(autocomplete_times)
+    values = {
+        "wait_timeout": int(_clamp(math.ceil(page * 3), 5, 30)),
+        "field_wait_timeout": int(_clamp(math.ceil(autocomplete * 3), 3, 15)),
+        "overlay_max_wait": int(_clamp(math.ceil(page * 4), 10, 60)),
+        "step_delay": round(_clamp(autocomplete * 1.2, 0.2, 2), 2),
+        "autocomplete_delay": round(_clamp(autocomplete * 1.5, 0.3, 5), 2),
+        "page_load_delay": round(_clamp(page * 1.5, 0.5, 5), 2),
+    }
+    logger_debug(f"CALIBRATION: page load max {page:.2f}s, autocomplete max {autocomplete:.2f}s")
+    logger_debug(f"CALIBRATION: profile {values}")
+    return values
+
+def run_calibration(excel_file_path, profile_name, profiles_path=None, probes=3):
+    """Log in, calibrate timing against the server and write the profile back"""
+    sample_text = "a"
+    if os.path.exists(excel_file_path):
+        excel_processor = ExcelDataProcessor(excel_file_path)
+        first_row = excel_processor.get_row_data(0)
+        if first_row is not None and len(first_row) > 3:
+            sample_text = str(first_row.iloc[3])
+
+    driver = setup_driver()
+    try:
+        wait = WebDriverWait(driver, ProcessingConfig.WAIT_TIMEOUT)
+        login(driver, wait)
+        values = calibrate_timing(driver, wait, sample_text, probes)
+        ProcessingConfig.save_timing_profile(profile_name, values, profiles_path)
+        return 0
+    except Exception as e:
+        logger.error(f"Calibration failed: {e}")
+        return 1
+    finally:
+        driver.quit()
+
+def run_preflight(excel_file_path):
+    """Report row count and create/duplicate plan without starting Chrome"""
+    started = time.perf_counter()
+    if not os.path.exists(excel_file_path):
+        logger.error(f"Excel file not found: {excel_file_path}")
+        return 1
+    excel_processor = ExcelDataProcessor(excel_file_path)
+    if ProcessingConfig.DELTA_PROCESSING:
+        row_ledger.load(ProcessingConfig.LEDGER_PATH)
+        excel_processor.reduce_to_delta(row_ledger)
+    if ProcessingConfig.SCHEDULE_BY_DEADLINE:
+        excel_processor.schedule_by_deadline(ProcessingConfig.PRIORITY_COLUMN)
+    plan = excel_processor.build_plan()
+    creates = sum(1 for _, action in plan if action == "create")
+    for row_index, action in plan:
+        row_data = excel_processor.get_row_data(row_index)
+        logger_debug(f"Row {excel_processor.source_row(row_index)}: {action} - No. Docket: {row_data.get('No. Docket', 'Unknown')}")
+    for key, row_indexes in excel_processor.docket_index().items():
+        if len(row_indexes) > 1:
+            logger_debug(f"PRE-FLIGHT: No. Docket '{key}' appears in rows {', '.join(str(excel_processor.source_row(i)) for i in row_indexes)}")
+    logger_debug(f"PRE-FLIGHT: {len(plan)} rows, {creates} create, {len(plan) - creates} duplicate")
+    logger_debug(f"PRE-FLIGHT selesai dalam {time.perf_counter() - started:.3f}s (browser tidak dibuka)")
+    return 0
+
+def benchmark_startup(excel_file_path, runs=5):
+    """Measure cold-start time of the pre-flight path and of the lazy imports"""
+    command = [sys.executable] if getattr(sys, "frozen", False) else [sys.executable, os.path.abspath(__file__)]
+    command += ["--preflight", "--excel", excel_file_path]
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - started)
+    logger_debug(f"STARTUP BENCHMARK ({runs} runs, --preflight): "
+                 f"min {min(timings):.3f}s, median {statistics.median(timings):.3f}s, max {max(timings):.3f}s")
+
+    # Biaya import lazy yang ditunda dari startup
+    started = time.perf_counter()
+    import pandas  # noqa: F401
+    logger_debug(f"  import pandas: {time.perf_counter() - started:.3f}s")
+    started = time.perf_counter()
+    load_selenium()
+    logger_debug(f"  import selenium: {time.perf_counter() - started:.3f}s")
+    return timings
+
+def run_import_export(excel_file_path, output_dir, upload):
+    """Export the workbook as import batches and optionally upload them"""
+    if not os.path.exists(excel_file_path):
+        logger.error(f"Excel file not found: {excel_file_path}")
+        return 1
+    paths = export_import_batches(ExcelDataProcessor(excel_file_path), output_dir)
+    if not upload or not paths:
+        return 0
+
+    driver = setup_driver()
+    try:
+        wait = WebDriverWait(driver, ProcessingConfig.WAIT_TIMEOUT)
+        login(driver, wait)
+        results = bulk_import_all(driver, wait, paths)
+        logger_debug(f"BULK IMPORT: {len(results['imported'])} batches imported, {len(results['failed'])} failed")
+        return 0 if not results['failed'] else 1
+    finally:
+        driver.quit()
+
+def run_replay(recording_dir, update_baseline=False):
+    """Replay a recorded session against the current code with no browser or network.
+
+    Reports command counts, simulated wall time and row outcomes, compares them
+    with baseline.json in the recording and returns 1 on a regression.
+    """
+    global time, replay_executor
+    load_selenium()
+    import selenium.webdriver.support.wait as selenium_wait
+
+    with open(os.path.join(recording_dir, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(os.path.join(recording_dir, "commands.jsonl"), encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    clock = SimulatedClock()
+    real_time, saved_config = time, {key: getattr(ProcessingConfig, key) for key in ProcessingConfig.TIMING_KEYS + ("FORENSICS_ENABLED",)}
+    for key, value in meta["timing"].items():
+        setattr(ProcessingConfig, key.upper(), value)
+    ProcessingConfig.FORENSICS_ENABLED = False
+    command_profiler.enabled, command_profiler.records = True, []
+    replay_executor = ReplayExecutor(entries, clock)
+    time = selenium_wait.time = clock
+    random.seed(meta["seed"])
+    results = {'successful_rows': [], 'failed_rows': [], 'skipped_rows': []}
+    error = None
+    try:
+        excel_processor = ExcelDataProcessor(os.path.join(recording_dir, "workbook.xlsx"))
+        driver = setup_driver()
+        wait = WebDriverWait(driver, ProcessingConfig.WAIT_TIMEOUT)
+        login(driver, wait)
+        results = process_all_rows(driver, wait, excel_processor, BrowserWatchdog(driver, wait))
+    except Exception as e:
+        # Replay yang berhenti di tengah jalan tetap dilaporkan (dan dihitung sebagai regresi)
+        error = f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        logger.error(f"Replay aborted: {error}")
+    finally:
+        time = selenium_wait.time = real_time
+        executor, replay_executor = replay_executor, None
+        for key, value in saved_config.items():
+            setattr(ProcessingConfig, key, value)
+        command_profiler.enabled = False
+
+    steps = {}
+    for _, step, _, _, _ in command_profiler.records:
+        steps[step] = steps.get(step, 0) + 1
+    report = {
+        "commands": len(command_profiler.records),
+        "simulated_seconds": round(clock.now, 1),
+        "unmatched_commands": executor.misses,
+        "successful": len(results['successful_rows']),
+        "failed": len(results['failed_rows']),
+        "skipped": len(results['skipped_rows']),
+        "commands_per_step": steps,
+        "error": error,
+    }
+    logger_debug(f"REPLAY {recording_dir}: {report['commands']} commands ({executor.misses} unmatched), "
+                 f"simulated {report['simulated_seconds']}s, ok {report['successful']}, "
+                 f"failed {report['failed']}, skipped {report['skipped']}")
+
+    baseline_path = os.path.join(recording_dir, "baseline.json")
+    if update_baseline or not os.path.exists(baseline_path):
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logger_debug(f"Baseline written to {baseline_path}")
+        return 0
+
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    tolerance = 1 + ProcessingConfig.REPLAY_TOLERANCE
+    regressions = []
+    for key in ("commands", "simulated_seconds", "unmatched_commands"):
+        if report[key] > baseline[key] * tolerance and report[key] > baseline[key]:
+            regressions.append(f"{key} {baseline[key]} -> {report[key]}")
+    if report["successful"] < baseline["successful"]:
+        regressions.append(f"successful {baseline['successful']} -> {report['successful']}")
+    if report["failed"] + report["skipped"] > baseline["failed"] + baseline["skipped"]:
+        regressions.append(f"failed+skipped {baseline['failed'] + baseline['skipped']} -> {report['failed'] + report['skipped']}")
+    if error and not baseline.get("error"):
+        regressions.append(f"replay aborted: {error}")
+    for regression in regressions:
+        logger_debug(f"REPLAY REGRESSION: {regression}")
+    if not regressions:
+        logger_debug("REPLAY: no regression against baseline")
+    return 1 if regressions else 0
+
+def stop_at_time(value):
+    """argparse type for --stop-at: "HH:MM" on a 24-hour clock"""
+    match = re.fullmatch(r"(\d{1,2}):(\d{2})", value.strip())
+    if not match or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+        raise argparse.ArgumentTypeError(f"expected HH:MM (24-hour), got '{value}'")
+    return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="ODOO Automation Script - Excel Integration")
+    parser.add_argument("--excel", default=ProcessingConfig.EXCEL_FILE_PATH, help="Path to the Excel workbook")
+    parser.add_argument("--preflight", action="store_true", help="Report row count and plan without starting Chrome")
+    parser.add_argument("--benchmark-startup", type=int, nargs="?", const=5, default=0, metavar="RUNS",
+                        help="Time the startup path over RUNS cold starts (default 5)")
+    parser.add_argument("--profile", default=None, help="Timing profile name (default: the file's active profile)")
+    parser.add_argument("--profiles-file", default=ProcessingConfig.TIMING_PROFILES_PATH, help="Timing profiles JSON file")
+    parser.add_argument("--cold-form", action="store_true",
+                        help="Disable warm-form mode (full list-view reload for every new record)")
+    parser.add_argument("--slow-input", action="store_true",
+                        help="Type every field with keystrokes instead of fast script input")
+    parser.add_argument("--profile-commands", action="store_true",
+                        help="Count and time every WebDriver command per row, step and call site")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="Work on N forms in parallel tabs of one browser (default 1)")
+    parser.add_argument("--export-import", nargs="?", const=ProcessingConfig.IMPORT_DIR, default=None, metavar="DIR",
+                        help="Write Odoo import CSV batches for the workbook without starting Chrome")
+    parser.add_argument("--bulk-import", action="store_true",
+                        help="Write the import batches and upload them through Odoo's import screen")
+    parser.add_argument("--status-port", type=int, default=0,
+                        help="Serve live progress on http://127.0.0.1:PORT/status (JSON) and /metrics (Prometheus)")
+    parser.add_argument("--schedule", action="store_true",
+                        help="Process duplicate chains by oldest production date (column 0) first instead of file order")
+    parser.add_argument("--priority-column", default=None,
+                        help="Column whose lower numbers are processed first within a production date (implies --schedule)")
+    parser.add_argument("--stop-at", metavar="HH:MM", type=stop_at_time, default=None,
+                        help="End of the time window: stop before a chain that would overrun it and write the rest to "
+                             f"{ProcessingConfig.UNPROCESSED_PATH}")
+    parser.add_argument("--delta", action="store_true",
+                        help="Only process rows that are new or changed since earlier runs (fingerprints in the ledger)")
+    parser.add_argument("--ledger", metavar="PATH", default=None,
+                        help=f"Row fingerprint ledger file (default {ProcessingConfig.LEDGER_PATH}; implies --delta)")
+    parser.add_argument("--breaker-action", choices=("pause", "skip"), default=None,
+                        help="What to do while the error circuit breaker is open: wait for recovery probes (pause, default) "
+                             "or defer rows to the unprocessed workbook (skip)")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="Record the WebDriver command/response stream and page snapshots of this run into DIR")
+    parser.add_argument("--replay", metavar="DIR", default=None,
+                        help="Replay a recording without a browser and compare with its baseline (exit 1 on regression)")
+    parser.add_argument("--update-baseline", action="store_true", help="With --replay: store this replay as the new baseline")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Probe the server and write the tightest safe timings to --profile (default 'calibrated')")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main execution function with enhanced retry logic and improved structure"""
+    args = parse_args(argv)
+    if args.calibrate:
+        return run_calibration(args.excel, args.profile or "calibrated", args.profiles_file)
+    try:
+        ProcessingConfig.load_timing_profile(args.profile, args.profiles_file)
+    except (ValueError, json.JSONDecodeError) as e:
+        logger.error(f"Failed to load timing profile: {e}")
+        return 1
+    if args.cold_form:
+        ProcessingConfig.WARM_FORM = False
+    if args.slow_input:
+        ProcessingConfig.FAST_INPUT = False
+    command_profiler.enabled = args.profile_commands
+    if args.schedule or args.priority_column:
+        ProcessingConfig.SCHEDULE_BY_DEADLINE = True
+        ProcessingConfig.PRIORITY_COLUMN = args.priority_column or ProcessingConfig.PRIORITY_COLUMN
+    if args.stop_at:
+        ProcessingConfig.STOP_AT = args.stop_at
+    if args.breaker_action:
+        ProcessingConfig.BREAKER_ACTION = args.breaker_action
+    if args.delta or args.ledger:
+        ProcessingConfig.DELTA_PROCESSING = True
+        ProcessingConfig.LEDGER_PATH = args.ledger or ProcessingConfig.LEDGER_PATH
+    if args.replay:
+        return run_replay(args.replay, args.update_baseline)
+    if args.preflight:
+        return run_preflight(args.excel)
+    if args.export_import or args.bulk_import:
+        return run_import_export(args.excel, args.export_import or ProcessingConfig.IMPORT_DIR, args.bulk_import)
+    if args.benchmark_startup:
+        benchmark_startup(args.excel, args.benchmark_startup)
+        return 0
+
     driver = None
     excel_processor = None
+    watchdog = None
     
     try:
         # Initialize components
-        excel_file_path = "data.xlsx"  # Consider moving to config file
+        excel_file_path = args.excel
+        if args.record:
+            seed = random.randrange(1 << 30)
+            random.seed(seed)
+            session_recorder.start(args.record, excel_file_path, seed)
         driver, excel_processor = initialize_components(excel_file_path)
         if not driver or not excel_processor:
             return
         
-        wait = WebDriverWait(driver, 10)
+        if args.status_port:
+            start_status_server(args.status_port)
+        wait = WebDriverWait(driver, ProcessingConfig.WAIT_TIMEOUT)
         login(driver, wait)
+        watchdog = BrowserWatchdog(driver, wait)
         
         # Process all rows
-        results = process_all_rows(driver, wait, excel_processor)
+        if args.tabs > 1:
+            results = process_all_rows_multitab(driver, wait, excel_processor, args.tabs)
+        else:
+            results = process_all_rows(driver, wait, excel_processor, watchdog)
         
         # Log final summary
         log_processing_summary(
@@ -1125,13 +3446,20 @@ def main():
             results['failed_rows'], 
             results['skipped_rows'],
             results['last_success_info'], 
-            results['last_failure_info']
+            results['last_failure_info'],
+            results['unprocessed_rows'],
+            results['review_rows']
         )
 
     except Exception as e:
         logger.error(f"Unexpected error in main: {e}")
     finally:
-        cleanup_resources(driver)
+        if command_profiler.enabled:
+            command_profiler.report()
+        forensics.flush()
+        session_recorder.stop()
+        row_ledger.save()
+        cleanup_resources(watchdog.driver if watchdog else driver)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,27 @@
+import ODOO
+
+
+def open_breaker():
+    breaker = ODOO.CircuitBreaker()
+    breaker._trip("TimeoutException@save_form", 1.0, 5, Exception("timeout"))
+    breaker.next_probe = 0
+    assert breaker.gate() == "probe"
+    return breaker
+
+
+def test_outstanding_probe_pauses_with_poll_interval():
+    breaker = open_breaker()
+
+    assert breaker.gate() == "pause"
+    assert breaker.pause_seconds() == ODOO.ProcessingConfig.BREAKER_POLL_INTERVAL
+
+
+def test_session_lost_fails_outstanding_probe():
+    breaker = open_breaker()
+
+    breaker.session_lost()
+
+    assert breaker.probe_started is None
+    assert breaker.probe_interval == 2 * ODOO.ProcessingConfig.BREAKER_PROBE_INTERVAL
+    assert breaker.gate() == ODOO.ProcessingConfig.BREAKER_ACTION
+    assert breaker.pause_seconds() > 60
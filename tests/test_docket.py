@@ -0,0 +1,8 @@
+import ODOO
+
+
+def test_docket_matches_display_name_case_insensitively():
+    assert ODOO.docket_matches("ab12345", "AB12345")
+    assert ODOO.docket_matches(12345.0, "12345 - PROYEK A")
+    assert not ODOO.docket_matches("12345", "123456")
+    assert not ODOO.docket_matches("", "12345")
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+import ODOO
+
+
+class FakeDriver:
+    def __init__(self, state):
+        self.state = state
+
+    def execute_script(self, script, *args):
+        return self.state
+
+
+def recorder(calls, name=None):
+    """Step generator stub that records its call (the sample line number when unnamed)"""
+    def steps(driver, *args, **kwargs):
+        calls.append(name or args[0])
+        yield 0
+    return steps
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ODOO, "wait_for_loading_overlay_to_disappear", lambda *a, **k: None)
+    monkeypatch.setattr(ODOO, "select_docket_steps", recorder(calls, "select_docket"))
+    monkeypatch.setattr(ODOO, "fill_form_fields_steps", recorder([]))
+    monkeypatch.setattr(ODOO, "add_table_rows_steps", recorder(calls, "add_table_rows"))
+    monkeypatch.setattr(ODOO, "data_to_input_steps", recorder(calls))
+    return calls
+
+
+def form_state(values, lines):
+    return {'docket': values['no_docket'], 'fields': [value for _, value, _ in ODOO.docket_form_fields(values)],
+            'lines': lines}
+
+
+def displayed_lines(values):
+    return [{column: ODOO.derive_line_values(values, no_urut)[key]
+             for key, column in ODOO.ProcessingConfig.DUPLICATE_LINE_COLUMNS.items()} for no_urut in range(1, 5)]
+
+
+def make_values():
+    row = pd.Series(["2024-01-01", "1000", "K0", "PROYEK A", "TEKNISI", "FC 25", 12, "TM 1", "10:30"])
+    return row, ODOO.derive_row_values(row)
+
+
+def test_only_changed_sample_lines_are_rewritten(calls):
+    row, values = make_values()
+    lines = displayed_lines(values)
+    lines[2]['kode_benda_uji'] = "OLD"
+
+    ODOO.update_duplicated_form(FakeDriver(form_state(values, lines)), None, row, values)
+
+    assert calls == [3]
+
+
+def test_missing_line_column_reenters_all_lines(calls):
+    row, values = make_values()
+    lines = displayed_lines(values)
+    for cells in lines:
+        del cells['tempat_pengetesan']
+
+    ODOO.update_duplicated_form(FakeDriver(form_state(values, lines)), None, row, values)
+
+    assert calls == ["add_table_rows"]
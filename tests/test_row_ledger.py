@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+import ODOO
+
+COLUMNS = ['Tanggal', 'No. Docket', 'Kontraktor', 'Nama Proyek', 'Homebase', 'Nama Mutu', 'Slump', 'TM', 'Waktu Kirim']
+
+
+def make_row(docket, proyek, kontraktor="K0"):
+    return ["2024-01-01", docket, kontraktor, proyek, "TEKNISI", "FC 25", 12, "TM 1", "10:30"]
+
+
+def write_workbook(path, rows):
+    pd.DataFrame(rows, columns=COLUMNS).to_excel(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def load_ledger(workdir):
+    ledger = ODOO.RowLedger()
+    ledger.load(str(workdir / "row_fingerprints.json"))
+    return ledger
+
+
+def save_rows(workbook, ledger, row_indexes):
+    """Simulate a run that saved row_indexes of workbook"""
+    processor = ODOO.ExcelDataProcessor(workbook)
+    processor.reduce_to_delta(ledger)
+    for row_index in row_indexes:
+        ledger.mark_saved(processor.prepare_row(row_index))
+    ledger.save()
+
+
+def test_shared_docket_keeps_unsaved_row(workdir):
+    workbook = write_workbook(workdir / "data.xlsx", [make_row("1000", "PROYEK A"), make_row("1000", "PROYEK B", "K1")])
+    save_rows(workbook, load_ledger(workdir), [0])
+
+    processor = ODOO.ExcelDataProcessor(workbook)
+    counts = processor.reduce_to_delta(load_ledger(workdir))
+
+    assert counts == {"process": 1, "unchanged": 1, "needs_update": 0}
+    assert processor.source_row(0) == 2
+
+
+def test_changed_saved_row_needs_update(workdir):
+    workbook = write_workbook(workdir / "data.xlsx", [make_row("1000", "PROYEK A"), make_row("1001", "PROYEK A")])
+    save_rows(workbook, load_ledger(workdir), [0, 1])
+
+    workbook = write_workbook(workdir / "data.xlsx", [make_row("1000", "PROYEK A"), make_row("1001", "PROYEK X"),
+                                                      make_row("1002", "PROYEK A")])
+    processor = ODOO.ExcelDataProcessor(workbook)
+    counts = processor.reduce_to_delta(load_ledger(workdir))
+
+    assert counts == {"process": 1, "unchanged": 1, "needs_update": 1}
+    assert processor.source_row(0) == 3
+    assert (workdir / ODOO.ProcessingConfig.NEEDS_UPDATE_PATH).exists()